@@ -0,0 +1,30 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Keep the session face index of reveals current as the document changes
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+from Autodesk.Revit.DB import *
+import clr
+
+clr.AddReference("System")
+
+from pyrevit import EXEC_PARAMS
+from pyrevit import script
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> UPDATE FACE INDEX
+
+# same name as _faceindex.face_index_envvar, the library is only imported once the index has been built
+face_index_envvar = "PANELIZATIONFACEINDEX"
+
+# the index is only updated once it has been built in the session
+if script.get_envvar(face_index_envvar) is not None:
+    from _create import _faceindex as fi
+
+    args = EXEC_PARAMS.event_args
+    reveal_filter = ElementCategoryFilter(BuiltInCategory.OST_Reveals)
+    fi.update_face_index(args.GetDocument(), args.GetAddedElementIds(reveal_filter),
+                         args.GetModifiedElementIds(reveal_filter), args.GetDeletedElementIds())
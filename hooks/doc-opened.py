@@ -0,0 +1,22 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Discard the session face index of reveals of a document when it is opened
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+from pyrevit import EXEC_PARAMS
+from pyrevit import script
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> CLEAR FACE INDEX
+
+# same name as _faceindex.face_index_envvar, the library is only imported once the index has been built
+face_index_envvar = "PANELIZATIONFACEINDEX"
+
+# the document opened may differ from the one indexed under the same path or title, changed outside the session
+if script.get_envvar(face_index_envvar) is not None:
+    from _create import _faceindex as fi
+
+    fi.clear_face_index(EXEC_PARAMS.event_args.Document)
@@ -0,0 +1,366 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of the Revit-free planning core. Runs in CPython or IronPython without Revit:
+
+    cd lib && python -m _create._benchmark
+"""
+
+import random
+from timeit import default_timer as timer
+
+from _create import _planner as pl
+from _create import _takeoff as tk
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> SAMPLES
+
+def get_part_samples(count, seed=0):
+    """
+    Generate random part edges, covering parts shorter than a minimum panel up to long walls
+    :param count: number of parts
+    :param seed: random seed, samples are reproducible
+    :return: list of left edge, right edge
+    """
+    generator = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        part_length = pl.to_units(generator.uniform(0.5, 120.0))
+        part_centre_index = pl.to_units(generator.uniform(pl.to_feet(part_length) / 2, 200.0))
+        samples.append(pl.get_part_edge_index(part_length, part_centre_index))
+
+    return samples
+
+
+def get_out_range_samples(samples, displacement=0.5, seed=0):
+    """
+    Generate random openings out-ranges within each part
+    :param samples: list of left edge, right edge
+    :param displacement: the displacement distance set away from edges of openings (feet)
+    :param seed: random seed, samples are reproducible
+    :return: list of out-ranges per part
+    """
+    generator = random.Random(seed)
+    displacement = pl.to_units(displacement)
+    out_range_samples = []
+    for left_edge, right_edge in samples:
+        out_ranges = []
+        if left_edge - right_edge > pl.standard_panel:
+            for _ in range(generator.randint(1, 8)):
+                fenestration_width = pl.to_units(generator.uniform(2.0, 6.0))
+                centre_index = generator.randint(right_edge + pl.units_per_foot, left_edge - pl.units_per_foot)
+                left_index, right_index = pl.get_fenestration_edge_indexes(fenestration_width, centre_index)
+                out_ranges.extend(pl.get_fenestration_out_range(left_index, right_index, displacement))
+        out_range_samples.append(out_ranges)
+
+    return out_range_samples
+
+
+def get_takeoff_samples(count, seed=0):
+    """
+    Generate panelized parts data, repeating standard panel heights and lengths with some odd pieces
+    :param count: number of parts
+    :param seed: random seed, samples are reproducible
+    :return: list of height, length (units), thickness, volume, base level, area
+    """
+    generator = random.Random(seed)
+    heights = [pl.to_units(x) for x in (8.0, 9.0, 10.0, 12.0)]
+    samples = []
+    for _ in range(count):
+        height = generator.choice(heights)
+        if generator.random() < 0.8:
+            length = pl.standard_panel - pl.standard_reveal_edge_width
+        else:
+            length = generator.randint(pl.units_per_foot // 2, pl.standard_panel)
+        area = pl.to_feet(height) * pl.to_feet(length)
+        samples.append((height, length, 0.0625, area * 0.0625, 0.0, area))
+
+    return samples
+
+
+def get_baseline_reveal_indexes(left_edge, right_edge, rvt_year, exterior=True):
+    """
+    Reference layout of a part without openings as computed before the planner, in float feet with the constants
+    of the templates
+    :param left_edge: The left edge of the part (feet)
+    :param right_edge: The right edge of the part (feet)
+    :param rvt_year: Revit version
+    :param exterior: Bool panelization from left to right
+    :return: collection of reveal indexes (feet)
+    """
+    if rvt_year >= 2023:  # template provided uses reveal width 15/16"
+        panelling_distance = 3.927083 - 0.005208  # 3' 11 1/8" - 1/16"
+        reveal_width = 0.039063
+        right_edge = right_edge + reveal_width
+        left_edge = left_edge - reveal_width
+    else:  # template provided uses reveal width 7/8"
+        panelling_distance = 3.927083  # 3' 11 1/8"
+        reveal_width = 0.072917
+        right_edge = right_edge + reveal_width
+
+    minimum_panel = 2
+    reveal_edge_width = 0.078125
+    reveal_indexes = []
+    while True:
+        if exterior:
+            left_edge -= panelling_distance
+            reveal_indexes.append(left_edge)
+            rem_length = left_edge - (right_edge - reveal_edge_width)
+            if rem_length < 4.0000:
+                if rem_length < minimum_panel:
+                    del reveal_indexes[-1]
+                    if len(reveal_indexes) != 0:
+                        left_edge = reveal_indexes[-1]
+                    rem = left_edge - right_edge - (minimum_panel - reveal_edge_width)
+                    left_edge -= rem
+                    reveal_indexes.append(left_edge)
+                break
+        else:
+            right_edge += panelling_distance
+            reveal_indexes.append(right_edge)
+            rem_length = left_edge - (right_edge - reveal_edge_width)
+            if rem_length < 4.0000:
+                if rem_length < minimum_panel:
+                    del reveal_indexes[-1]
+                    if len(reveal_indexes) != 0:
+                        right_edge = reveal_indexes[-1]
+                    rem = left_edge - right_edge - (minimum_panel - reveal_edge_width)
+                    right_edge += rem
+                    reveal_indexes.append(right_edge)
+                break
+
+    return reveal_indexes
+
+
+def is_matching_layout(expected_indexes, actual_indexes, tolerance):
+    """
+    Check that two layouts have the same number of reveals, each within a tolerance of the other
+    :param expected_indexes: reveal indexes (units)
+    :param actual_indexes: reveal indexes (units)
+    :param tolerance: tolerance (units)
+    :return: Bool
+    """
+    if len(expected_indexes) != len(actual_indexes):
+        return False
+
+    return all(abs(x - y) <= tolerance for x, y in zip(expected_indexes, actual_indexes))
+
+
+def get_quadratic_summary_data(parts_data, cost_per_sf):
+    """
+    Reference takeoff as aggregated before: a pass over all parts for every part, then every type
+    :return: rows of the summary, as get_summary_data
+    """
+    types = {}
+    for default_part in parts_data:
+        count = 0
+        for part in parts_data:
+            if (default_part[0], default_part[1]) == (part[0], part[1]):
+                count += 1
+        types[(default_part[0], default_part[1])] = count
+
+    final_data = []
+    for part_type, count in types.items():
+        for part in parts_data:
+            if part_type == (part[0], part[1]):
+                final_data.append([pl.to_feet(part[0]), pl.to_feet(part[1]), count])
+                break
+
+    return final_data
+
+
+def is_valid_layout(reveal_indexes, left_edge, right_edge, out_ranges, panel_spec, exterior=True):
+    """
+    Check that no reveal falls strictly within an out-range and no panel exceeds a full panel
+    :return: Bool
+    """
+    starts, ends = pl.merge_out_ranges(out_ranges)
+    for reveal_index in reveal_indexes:
+        for start, end in zip(starts, ends):
+            if start < reveal_index < end:
+                return False
+
+    panel_lengths = pl.get_panel_lengths(reveal_indexes, left_edge, right_edge, panel_spec, exterior)
+    full_panel = panel_spec.panelling_distance + panel_spec.reveal_edge_width
+    return max(panel_lengths[:-1] + [0]) <= full_panel and panel_lengths[-1] < panel_spec.maximum_panel
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> BENCHMARKS
+
+def benchmark_uniform_layout(count=20000, tolerance=1):
+    """
+    Compare the closed-form layout of parts without openings with the float layout computed before the planner,
+    then time it against the step-by-step layout
+    :param count: number of parts per panel spec and direction
+    :param tolerance: largest difference of a reveal from the float layout (units)
+    :return: number of parts compared, number of mismatches, step-by-step time, closed-form time
+    """
+    samples = get_part_samples(count)
+    compared = 0
+    mismatches = 0
+    iterative_time = 0
+    closed_form_time = 0
+
+    for rvt_year in (2022, 2023):
+        panel_spec = pl.get_panel_spec(rvt_year)
+        for exterior in (True, False):
+            start = timer()
+            for left, right in samples:
+                pl.iterate_reveal_indexes(left, right, [], panel_spec, exterior)
+            iterative_time += timer() - start
+
+            start = timer()
+            actual = [pl.get_uniform_reveal_indexes(left, right, panel_spec, exterior) for left, right in samples]
+            closed_form_time += timer() - start
+
+            for (left, right), actual_indexes in zip(samples, actual):
+                expected_indexes = get_baseline_reveal_indexes(pl.to_feet(left), pl.to_feet(right), rvt_year,
+                                                               exterior)
+                compared += 1
+                if not is_matching_layout([x * pl.units_per_foot for x in expected_indexes], actual_indexes,
+                                          tolerance):
+                    mismatches += 1
+
+    return compared, mismatches, iterative_time, closed_form_time
+
+
+def benchmark_optimal_layout(count=2000):
+    """
+    Time the optimal layout of parts with openings and compare it with the greedy layout by panel count, then by
+    pieces below the minimum panel. A greedy layout with a reveal within an out-range or an oversized panel is worse.
+    :param count: number of parts per direction
+    :return: number of parts solved, better than greedy count, worse than greedy count, average time (ms),
+     worst time (ms)
+    """
+    samples = get_part_samples(count, seed=1)
+    out_range_samples = get_out_range_samples(samples, seed=1)
+    panel_spec = pl.get_panel_spec(2023)
+    minimum_panel = panel_spec.minimum_panel
+    solved = 0
+    better = 0
+    worse = 0
+    total_time = 0
+    worst_time = 0
+
+    for exterior in (True, False):
+        for (left, right), out_ranges in zip(samples, out_range_samples):
+            if len(out_ranges) == 0:
+                continue
+            start = timer()
+            optimal_indexes = pl.get_optimal_reveal_indexes(left, right, out_ranges, panel_spec, exterior)
+            elapsed = timer() - start
+            total_time += elapsed
+            worst_time = max(worst_time, elapsed)
+
+            if optimal_indexes is None:
+                continue
+            solved += 1
+            greedy_indexes = pl.iterate_reveal_indexes(left, right, out_ranges, panel_spec, exterior)
+            if not is_valid_layout(greedy_indexes, left, right, out_ranges, panel_spec, exterior):
+                better += 1
+                continue
+
+            scores = []
+            for reveal_indexes in (optimal_indexes, greedy_indexes):
+                panel_lengths = pl.get_panel_lengths(reveal_indexes, left, right, panel_spec, exterior)
+                scores.append((len(panel_lengths), len([x for x in panel_lengths if x < minimum_panel])))
+            if scores[0] < scores[1]:
+                better += 1
+            elif scores[0] > scores[1]:
+                worse += 1
+
+    return solved, better, worse, 1000 * total_time / max(solved, 1), 1000 * worst_time
+
+
+def benchmark_plan_cache(count=5000, geometries=200, optimal=False):
+    """
+    Plan a stream of parts repeating a small set of geometries at different positions along their walls
+    :param count: number of parts
+    :param geometries: number of distinct part geometries
+    :param optimal: Bool optimal layout
+    :return: cache hits, cache misses, plans differing from the uncached plan, uncached time, cached time
+    """
+    generator = random.Random(2)
+    samples = get_part_samples(geometries, seed=2)
+    out_range_samples = get_out_range_samples(samples, seed=2)
+    panel_spec = pl.get_panel_spec(2023)
+
+    stream = []
+    for _ in range(count):
+        i = generator.randrange(geometries)
+        left_edge, right_edge = samples[i]
+        shift = pl.to_units(generator.uniform(-50.0, 50.0))
+        out_ranges = [[start + shift, end + shift] for start, end in out_range_samples[i]]
+        stream.append((left_edge - right_edge, (left_edge + right_edge) // 2 + shift, out_ranges))
+
+    start = timer()
+    expected = []
+    for part_length, part_centre_index, out_ranges in stream:
+        left_edge, right_edge = pl.get_part_edge_index(part_length, part_centre_index)
+        expected.append(pl.get_reveal_indexes(left_edge, right_edge, out_ranges, panel_spec, True, optimal))
+    uncached_time = timer() - start
+
+    pl.clear_plan_cache()
+    start = timer()
+    actual = [pl.plan_reveal_indexes(part_length, part_centre_index, out_ranges, panel_spec, True, True, optimal)
+              for part_length, part_centre_index, out_ranges in stream]
+    cached_time = timer() - start
+
+    hits, misses, size = pl.get_plan_cache_info()
+    mismatches = sum(1 for x, y in zip(expected, actual) if list(x) != list(y))
+    return hits, misses, mismatches, uncached_time, cached_time
+
+
+def benchmark_takeoff(counts=(10000, 50000, 100000), reference_count=2000):
+    """
+    Time the takeoff aggregation, checking it against the quadratic reference on a smaller sample
+    :param counts: numbers of parts
+    :param reference_count: number of parts compared with the quadratic reference
+    :return: reference time, linear time of the reference sample, mismatched panel types,
+     list of number of parts, time
+    """
+    samples = get_takeoff_samples(reference_count, seed=3)
+    start = timer()
+    expected = get_quadratic_summary_data(samples, 1.0)
+    reference_time = timer() - start
+
+    start = timer()
+    actual = tk.get_summary_data(samples, 1.0)
+    linear_time = timer() - start
+    mismatches = len(set((x[0], x[1], x[2]) for x in expected) ^ set((x[0], x[1], x[6]) for x in actual[:-1]))
+
+    timings = []
+    for count in counts:
+        samples = get_takeoff_samples(count, seed=3)
+        start = timer()
+        tk.get_summary_data(samples, 1.0)
+        timings.append((count, timer() - start))
+
+    return reference_time, linear_time, mismatches, timings
+
+
+def main():
+    compared, mismatches, iterative_time, closed_form_time = benchmark_uniform_layout()
+    print("Uniform layout: {} parts, {} mismatches with the float layout".format(compared, mismatches))
+    print("  step-by-step: {:.3f}s, closed-form: {:.3f}s".format(iterative_time, closed_form_time))
+
+    solved, better, worse, average_time, worst_time = benchmark_optimal_layout()
+    print("Optimal layout: {} parts, {} better, {} worse than greedy".format(solved, better, worse))
+    print("  average: {:.2f}ms, worst: {:.2f}ms per part".format(average_time, worst_time))
+
+    for optimal in (False, True):
+        hits, misses, mismatches, uncached_time, cached_time = benchmark_plan_cache(optimal=optimal)
+        print("Plan cache ({}): {} hits, {} misses, {} mismatches".format("optimal" if optimal else "greedy", hits,
+                                                                          misses, mismatches))
+        print("  uncached: {:.3f}s, cached: {:.3f}s".format(uncached_time, cached_time))
+
+    reference_time, linear_time, mismatches, timings = benchmark_takeoff()
+    print("Takeoff: {} mismatched panel types".format(mismatches))
+    print("  2000 parts, quadratic: {:.3f}s, single pass: {:.3f}s".format(reference_time, linear_time))
+    for count, elapsed in timings:
+        print("  {} parts: {:.3f}s".format(count, elapsed))
+
+
+if __name__ == "__main__":
+    main()
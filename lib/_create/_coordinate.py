@@ -28,35 +28,122 @@ active_view = doc.ActiveView
 active_level = doc.ActiveView.GenLevel
 
 
-# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> COORDINATES
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> WALL FRAMES
 
-def determine_x_plane(wall_id):
+# wall frames computed in the current run, keyed by host wall id
+wall_frames = {}
+
+
+class WallFrame(object):
     """
-    Determine the direction of the wall's path curve : x or y-axis
-    :param wall_id: The host wall id
-    :return: X-axis bool. host wall curve direction : x axis (True) , y axis (False) or neither on x nor y-axis (None)
+    Geometry frame of a host wall's path curve, computed once per wall and shared by its parts and openings
     """
 
-    wall = doc.GetElement(wall_id)
+    def __init__(self, wall_id):
+        """
+        :param wall_id: The host wall id
+        """
+        wall = doc.GetElement(wall_id)
+        curve = wall.Location.Curve
+
+        # determine the plane of the wall
+        direction = curve.Direction
+
+        if direction.X == -1 or direction.X == 1:
+            x_axis = True
+
+        elif direction.Y == -1 or direction.Y == 1:
+            x_axis = False
+
+        else:
+            # the wall curve is neither on x or y axis
+            raise eh.XYAxisPlaneNotEstablishedError
+
+        self.wall_id = wall_id
+        self.origin = curve.GetEndPoint(0)  # the path curve origin
+        self.end = curve.GetEndPoint(1)
+        self.direction = direction
+        self.x_axis = x_axis
+        self.length = curve.Length
+        self.flipped = wall.Flipped
+
+        self.start_coordinate = float(get_plane_coordinate(self.origin, x_axis))
+        self.end_coordinate = float(get_plane_coordinate(self.end, x_axis))
+
+        # the path curve origin, default datum of the indexes
+        self.datum = self.start_coordinate
+
+    def get_datum(self, side_of_wall, reveal=None):
+        """
+        Get the plane coordinate of the reveal at distance 0, with no model writes.
+        The distance of a vertical reveal (WallSweepInfo.Distance) runs along the path curve from its start on the
+        exterior side of the wall and from its end on the interior side; flipping the wall swaps the sides.
+        An existing vertical reveal on the side anchors the datum to its centre less its distance, which accounts for
+        wall joins and the profile; otherwise the reveal is taken as centred on its distance from the curve end.
+        :param side_of_wall: side of the wall to which the reveal is attached
+        :param reveal: existing vertical reveal on the side of the wall, optional
+        :return: x or y coordinate of the reveal at distance 0
+        """
+        from_start = (side_of_wall == WallSide.Exterior) != bool(self.flipped)
+        if from_start:
+            datum, towards = self.start_coordinate, self.end_coordinate
+        else:
+            datum, towards = self.end_coordinate, self.start_coordinate
+
+        centre = get_bounding_box_center(reveal) if reveal is not None else None
+        if centre is None:
+            return datum
+
+        # the plane coordinate grows or shrinks as the reveal distance grows
+        step_sign = 1 if towards >= datum else -1
+        reveal_coordinate = float(get_plane_coordinate(centre, self.x_axis))
+        return reveal_coordinate - step_sign * reveal.GetWallSweepInfo().Distance
+
+    def get_index(self, xyz_coordinates, reveal_coordinate_0=None):
+        """
+        Get the distance position (index) of xyz coordinates along the wall's path curve
+        :param xyz_coordinates: xyz coordinates of an element
+        :param reveal_coordinate_0: reveal coordinate at 0, defaults to the path curve origin
+        :return: index
+        """
+        if reveal_coordinate_0 is None:
+            reveal_coordinate_0 = self.datum
+
+        plane_coordinate = float(get_plane_coordinate(xyz_coordinates, self.x_axis))
+        return abs(plane_coordinate - reveal_coordinate_0)
+
+
+def get_wall_frame(wall_id):
+    """
+    Get the geometry frame of a host wall, computed on first request and reused for the rest of the run
+    :param wall_id: The host wall id
+    :return: WallFrame
+    """
+    frame = wall_frames.get(wall_id)
+    if frame is None:
+        frame = WallFrame(wall_id)
+        wall_frames[wall_id] = frame
 
-    # determine the plane of the wall
-    wall_direction = wall.Location.Curve.Direction
+    return frame
 
-    # direction coordinates
-    x_direction = wall_direction.X
-    y_direction = wall_direction.Y
 
-    if x_direction == -1 or x_direction == 1:
-        x_axis = True
+def clear_wall_frames():
+    """
+    Discard wall frames computed in a previous run
+    :return: None
+    """
+    wall_frames.clear()
 
-    elif y_direction == -1 or y_direction == 1:
-        x_axis = False
 
-    else:
-        # the wall curve is neither on x or y axis
-        raise eh.XYAxisPlaneNotEstablishedError
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> COORDINATES
 
-    return x_axis
+def determine_x_plane(wall_id):
+    """
+    Determine the direction of the wall's path curve : x or y-axis
+    :param wall_id: The host wall id
+    :return: X-axis bool. host wall curve direction : x axis (True) , y axis (False) or neither on x nor y-axis (None)
+    """
+    return get_wall_frame(wall_id).x_axis
 
 
 def get_plane_coordinate(xyz_coordinates, x_axis_plane):
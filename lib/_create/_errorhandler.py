@@ -62,6 +62,14 @@ class DeleteElementsError(Exception):
     """
     pass
 
+# catch reveal not selected error
+class RevealNotSelectedError(Exception):
+    """
+    Catch error: the element selected is not a reveal
+    """
+    pass
+
+
 # catch instances where parts/walls are not along a x or y axis
 class XYAxisPlaneNotEstablishedError(Exception):
     """
@@ -69,3 +77,18 @@ class XYAxisPlaneNotEstablishedError(Exception):
     """
     pass
 
+
+# error occurred creating/applying the highlight view filters
+class HighlightFiltersError(Exception):
+    """
+    Catch error: highlight view filters could not be applied to the view
+    """
+    pass
+
+
+# lap types could not be found in the document
+class LapTypeNotFoundError(Exception):
+    """
+    Catch error: lap (reveal) types could not be found by name, type mark or template id
+    """
+    pass
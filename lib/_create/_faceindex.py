@@ -0,0 +1,186 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Session face index of the reveals of each document: the reveals on each face (host wall, wall side) with their
+distance along the wall's path curve. Built on the first request of the session, kept current by
+hooks/doc-changed.py and discarded by hooks/doc-opened.py and hooks/doc-closing.py. Every function takes the
+document, nothing is bound to the active document on import, the hooks import this module only.
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+from Autodesk.Revit.DB import *
+import clr
+
+clr.AddReference("System")
+
+from _create import _planner as pl
+
+from pyrevit import script
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
+
+# face index per document kept for the session, the name is repeated in the hooks
+face_index_envvar = "PANELIZATIONFACEINDEX"
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> FACE FUNCTIONS
+
+def get_id_value(element_id):
+    """
+    Abstract the integer value of an element id, ElementId.Value replaces IntegerValue from Revit 2024
+    :param element_id: element id
+    :return: integer value
+    """
+    value = getattr(element_id, "Value", None)
+    if value is None:
+        value = element_id.IntegerValue
+    return value
+
+
+def get_face(reveal):
+    """
+    Abstract the face of a reveal, the host wall and the wall side it is placed on
+    :param reveal: reveal
+    :return: host wall id (int), wall side (int). None if the element is not a wall sweep
+    """
+    if not isinstance(reveal, WallSweep):
+        return None
+    host_id = reveal.GetHostIds()[0]
+    return get_id_value(host_id), int(reveal.GetWallSweepInfo().WallSide)
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> FACE INDEX
+
+def index_faces(document):
+    """
+    Group all reveals in a document by face in a single pass
+    :param document: Revit document
+    :return: face index, dictionary of faces to reveal ids (int) to distance (units, None for horizontal
+     reveals), and of reveal ids to faces
+    """
+    all_reveals = FilteredElementCollector(document).OfCategory(BuiltInCategory.OST_Reveals). \
+        WhereElementIsNotElementType().ToElements()
+
+    index = {"faces": {}, "reveals": {}}
+    for reveal in all_reveals:
+        add_face_reveal(index, reveal)
+
+    return index
+
+
+def add_face_reveal(index, reveal):
+    """
+    Add a reveal to a face index, replacing its previous face and distance
+    :param index: face index
+    :param reveal: reveal
+    :return: None
+    """
+    reveal_id = get_id_value(reveal.Id)
+    remove_face_reveal(index, reveal_id)
+
+    face = get_face(reveal)
+    if face is None:
+        return
+
+    wall_sweep_info = reveal.GetWallSweepInfo()
+    distance = pl.to_units(wall_sweep_info.Distance) if wall_sweep_info.IsVertical else None
+    index["faces"].setdefault(face, {})[reveal_id] = distance
+    index["reveals"][reveal_id] = face
+
+
+def remove_face_reveal(index, reveal_id):
+    """
+    Remove a reveal from a face index
+    :param index: face index
+    :param reveal_id: reveal id (int)
+    :return: None
+    """
+    face = index["reveals"].pop(reveal_id, None)
+    if face is not None:
+        index["faces"][face].pop(reveal_id, None)
+
+
+def get_face_indexes():
+    """
+    Retrieve the face indexes of the session
+    :return: dictionary of document to face index
+    """
+    face_indexes = script.get_envvar(face_index_envvar)
+    if face_indexes is None:
+        face_indexes = {}
+        script.set_envvar(face_index_envvar, face_indexes)
+
+    return face_indexes
+
+
+def get_face_index(document):
+    """
+    Retrieve the face index of a document, built on the first request of the session.
+    Reveals no longer in the document are dropped before the index is served.
+    :param document: Revit document
+    :return: face index
+    """
+    face_indexes = get_face_indexes()
+    key = document.PathName or document.Title
+    index = face_indexes.get(key)
+    if index is None:
+        index = index_faces(document)
+        face_indexes[key] = index
+    else:
+        for reveal_id in [x for x in index["reveals"] if document.GetElement(ElementId(x)) is None]:
+            remove_face_reveal(index, reveal_id)
+
+    return index
+
+
+def update_face_index(document, added_ids, modified_ids, deleted_ids):
+    """
+    Update the face index of a document with changed elements, if it has been built
+    :param document: Revit document
+    :param added_ids: ids of reveals added
+    :param modified_ids: ids of reveals modified
+    :param deleted_ids: ids of elements deleted
+    :return: None
+    """
+    face_indexes = script.get_envvar(face_index_envvar)
+    if face_indexes is None:
+        return
+    index = face_indexes.get(document.PathName or document.Title)
+    if index is None:
+        return
+
+    for element_id in deleted_ids:
+        remove_face_reveal(index, get_id_value(element_id))
+    for element_id in list(added_ids) + list(modified_ids):
+        reveal = document.GetElement(element_id)
+        if reveal is not None:
+            add_face_reveal(index, reveal)
+
+
+def clear_face_index(document):
+    """
+    Discard the face index of a document, it is built again on the next request
+    :param document: Revit document
+    :return: None
+    """
+    get_face_indexes().pop(document.PathName or document.Title, None)
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> FACE QUERIES
+
+def get_face_reveal_ids(document, faces):
+    """
+    Retrieve the ids of all reveals on the faces provided
+    :param document: Revit document
+    :param faces: collection of faces, host wall id (int), wall side (int)
+    :return: sorted reveal ids (int)
+    """
+    index = get_face_index(document)
+    reveal_ids = set()
+    for face in faces:
+        reveal_ids.update(index["faces"].get(face, ()))
+
+    return sorted(reveal_ids)
+
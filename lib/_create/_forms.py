@@ -29,6 +29,17 @@ app = __revit__.Application  # represents the Revit Autodesk Application
 doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
 uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
 
+# alerts of the errors a part can fail to be panelized with
+error_alerts = (
+    (e.RevealNotCreatedError, 'Reveal at coordinate 0 could not be created'),
+    (e.CentreIndexError, "Centre Index could not be established"),
+    (e.VariableDistanceNotFoundError, "The variable distance could not be established"),
+    (e.DeleteElementsError, 'Error occurred. Could not delete reveals'),
+    (e.XYAxisPlaneNotEstablishedError, 'Could not Panelize. Selected Part not on X or Y axis'),
+    (e.LapTypeNotFoundError, 'Could not Panelize. Left Lap or Right Lap reveal type not found in the model'),
+    (e.HighlightFiltersError, 'Error occurred. Could not apply the highlight filters to the view'),
+)
+
 
 # ________________________________________________________________________________________________
 
@@ -114,3 +125,85 @@ def form_switch_panelization_direction():
 
     return option
 
+
+def form_layout_mode():
+    """
+    User input form for selecting the panel layout around openings
+    :return: Bool option, True for the optimal layout
+    """
+    ans = forms.ask_for_one_item(['Greedy', 'Optimal'], default='Greedy',
+                                 prompt='Greedy [default] or Optimal (fewest panels and pieces below minimum) :',
+                                 title='Panel Layout')
+    if ans == "Optimal":
+        option = True
+    else:
+        option = False
+
+    return option
+
+
+def form_existing_reveals():
+    """
+    User input form for selecting how reveals existing within the parts are treated
+    :return: Bool option, True to rebalance the existing reveals to the new plan
+    """
+    ans = forms.ask_for_one_item(['Keep', 'Rebalance'], default='Keep',
+                                 prompt='Keep existing reveals [default] or Rebalance them to the new plan :',
+                                 title='Existing Reveals')
+    if ans == "Rebalance":
+        option = True
+    else:
+        option = False
+
+    return option
+
+
+def form_reset_graphics():
+    """
+    User input form for selecting the parts whose highlight is reset
+    :return: Bool option, True to reset all parts highlighted
+    """
+    ans = forms.ask_for_one_item(['Panelized Parts', 'All Parts'], default='Panelized Parts',
+                                 prompt='Reset Panelized Parts [default] or All Parts highlighted, '
+                                        'removing the highlight filters from all views :',
+                                 title='Reset Graphics')
+    if ans == "All Parts":
+        option = True
+    else:
+        option = False
+
+    return option
+
+
+def get_error_alert(error, default_alert='Error occurred. Could not panelize parts'):
+    """
+    Get the alert of an error by its type
+    :param error: error raised
+    :param default_alert: alert of the errors without their own alert
+    :return: alert
+    """
+    for error_type, error_alert in error_alerts:
+        if isinstance(error, error_type):
+            return error_alert
+
+    return default_alert
+
+
+def form_failed_parts(failed_parts):
+    """
+    Alert the parts that could not be panelized, one alert per error
+    :param failed_parts: collection of part id, error
+    :return: None
+    """
+    alerts = []
+    failed_part_ids = {}
+    for part_id, error in failed_parts:
+        alert = get_error_alert(error)
+
+        if alert not in failed_part_ids:
+            alerts.append(alert)
+            failed_part_ids[alert] = []
+        failed_part_ids[alert].append("{} ({})".format(part_id, error) if str(error) else str(part_id))
+
+    for alert in alerts:
+        forms.alert(alert, sub_msg="Parts: " + ", ".join(failed_part_ids[alert]))
@@ -0,0 +1,173 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Run journal of the reveals created by a panelization run, grouped by wall and part, and of the reveals
+a rebalance moved or deleted, stored next to the document's pyRevit data so the last run can be reverted.
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+import io
+import json
+import os
+
+from pyrevit import script
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
+
+journal_file_id = "panelization_journal"
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> DOCUMENT DATA FUNCTIONS
+
+def get_data_file(file_id):
+    """
+    Retrieve the path of a data file of the active document
+    :param file_id: data file id
+    :return: file path
+    """
+    return script.get_document_data_file(file_id, "json")
+
+
+def save_data(file_id, data):
+    """
+    Save data of the active document as JSON
+    :param file_id: data file id
+    :param data: JSON serializable data
+    :return: None
+    """
+    with io.open(get_data_file(file_id), "w", encoding="utf-8") as data_file:
+        data_file.write(u"" + json.dumps(data, separators=(",", ":")))
+
+
+def load_data(file_id):
+    """
+    Load data of the active document
+    :param file_id: data file id
+    :return: data, None if it has not been saved
+    """
+    file_path = get_data_file(file_id)
+    if not os.path.exists(file_path):
+        return None
+
+    with io.open(file_path, "r", encoding="utf-8") as data_file:
+        return json.loads(data_file.read())
+
+
+def clear_data(file_id):
+    """
+    Delete data of the active document
+    :param file_id: data file id
+    :return: None
+    """
+    file_path = get_data_file(file_id)
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> JOURNAL FUNCTIONS
+
+def new_journal():
+    """
+    Create an empty run journal
+    :return: journal, reveal ids by part id by wall id, reveals moved and reveals deleted
+    """
+    return {"walls": {}, "moved": {}, "deleted": []}
+
+
+def record_reveals(journal, wall_id, part_id, reveal_ids):
+    """
+    Record the reveals created on a part
+    :param journal: run journal
+    :param wall_id: host wall id (int)
+    :param part_id: part id (int)
+    :param reveal_ids: collection of reveal ids (int)
+    :return: None
+    """
+    if len(reveal_ids) == 0:
+        return
+    parts = journal["walls"].setdefault(str(wall_id), {})
+    parts.setdefault(str(part_id), []).extend(reveal_ids)
+
+
+def record_moved_reveal(journal, reveal_id, distance, lap_type_id):
+    """
+    Record a reveal moved or retyped by a rebalance, only its position before the run is kept
+    :param journal: run journal
+    :param reveal_id: reveal id (int)
+    :param distance: distance of the reveal before the run (feet)
+    :param lap_type_id: wall sweep type id of the reveal before the run (int)
+    :return: None
+    """
+    journal["moved"].setdefault(str(reveal_id), [distance, lap_type_id])
+
+
+def record_deleted_reveal(journal, wall_id, side, distance, lap_type_id):
+    """
+    Record a reveal deleted by a rebalance
+    :param journal: run journal
+    :param wall_id: host wall id (int)
+    :param side: side of the wall, Exterior or Interior
+    :param distance: distance of the reveal (feet)
+    :param lap_type_id: wall sweep type id of the reveal (int)
+    :return: None
+    """
+    journal["deleted"].append([wall_id, side, distance, lap_type_id])
+
+
+def get_moved_reveals(journal):
+    """
+    Retrieve the reveals moved by the run, journals saved before rebalancing record none
+    :param journal: run journal
+    :return: dictionary of reveal id (int) to distance (feet), wall sweep type id (int) before the run
+    """
+    return dict((int(x), tuple(y)) for x, y in journal.get("moved", {}).items())
+
+
+def get_deleted_reveals(journal):
+    """
+    Retrieve the reveals deleted by the run, journals saved before rebalancing record none
+    :param journal: run journal
+    :return: collection of host wall id (int), side, distance (feet), wall sweep type id (int)
+    """
+    return [tuple(x) for x in journal.get("deleted", [])]
+
+
+def get_reveal_ids(journal):
+    """
+    Retrieve all reveal ids recorded in a journal
+    :param journal: run journal
+    :return: collection of reveal ids (int)
+    """
+    reveal_ids = []
+    for parts in journal["walls"].values():
+        for part_reveal_ids in parts.values():
+            reveal_ids.extend(part_reveal_ids)
+
+    return reveal_ids
+
+
+def save_journal(journal):
+    """
+    Save the journal of the last run, replacing the previous one
+    :param journal: run journal
+    :return: None
+    """
+    save_data(journal_file_id, journal)
+
+
+def load_journal():
+    """
+    Load the journal of the last run
+    :return: run journal, None if no run has been recorded
+    """
+    return load_data(journal_file_id)
+
+
+def clear_journal():
+    """
+    Delete the journal of the last run
+    :return: None
+    """
+    clear_data(journal_file_id)
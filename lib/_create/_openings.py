@@ -16,6 +16,7 @@ from _create import _transactions as a
 from _create import _test as t
 from _create import _parts as g
 from _create import _coordinate as c
+from _create import _planner as pl
 
 from pyrevit import forms
 
@@ -66,6 +67,28 @@ def get_fenestration_xyz_centre(fenestration_id):
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> GET HOSTED FENESTRATIONS
 
+# windows/doors of the current run grouped by host wall id, per built in category
+hosted_fenestrations_index = {}
+
+
+def index_hosted_fenestrations(built_in_category):
+    """
+    Group all windows/doors in the document by their host wall in a single pass
+    :param built_in_category: built in category doors or windows i.e. BuiltInCategory.OST_Windows
+    :return: dictionary of host wall id to list of fenestrations
+    """
+    all_fenestration = FilteredElementCollector(doc).OfCategory(built_in_category). \
+        WhereElementIsNotElementType().ToElements()
+
+    index = {}
+    for fenestration in all_fenestration:
+        host = fenestration.Host
+        if host is not None:
+            index.setdefault(host.Id, []).append(fenestration)
+
+    return index
+
+
 def get_hosted_fenestrations(wall_id, built_in_category):
     """
     Abstract all windows/doors hosted in a provided wall
@@ -74,18 +97,21 @@ def get_hosted_fenestrations(wall_id, built_in_category):
     i.e. BuiltInCategory.OST_Windows
     :return: list of filtered fenestrations
     """
-    # select all windows
-    all_fenestration = FilteredElementCollector(doc).OfCategory(built_in_category). \
-        WhereElementIsNotElementType().ToElements()
+    # the index is built on the first request of the run and reused for every part
+    index = hosted_fenestrations_index.get(built_in_category)
+    if index is None:
+        index = index_hosted_fenestrations(built_in_category)
+        hosted_fenestrations_index[built_in_category] = index
 
-    # store in a list all windows hosted by the wall
-    hosted_fenestrations = []
+    return list(index.get(wall_id, []))
 
-    for window in all_fenestration:
-        if window.Host.Id == wall_id:
-            hosted_fenestrations.append(window)
 
-    return hosted_fenestrations
+def clear_hosted_fenestrations_index():
+    """
+    Discard the windows/doors index built in a previous run
+    :return: None
+    """
+    hosted_fenestrations_index.clear()
 
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> GET INDEXES
@@ -99,20 +125,12 @@ def get_fenestration_centre_index(part, fenestration, reveal_coordinate_0):
     :return: Window centre index
     """
 
-    # determine the direction, x or y-axis
     hosted_wall_id = g.get_host_wall_id(part)
-    x_axis_plane = c.determine_x_plane(hosted_wall_id)
+    frame = c.get_wall_frame(hosted_wall_id)  # frame shared with the wall's parts
 
-    # get window/door coordinate centre
+    # get window/door centre and its index
     fenestration_xyz_centre = get_fenestration_xyz_centre(fenestration.Id)  # get window centre
-    fenestration_coordinate_centre = c.get_plane_coordinate(fenestration_xyz_centre,
-                                                            x_axis_plane)  # get window coordinate
-
-    # Get window index
-    if fenestration_coordinate_centre > reveal_coordinate_0:
-        fenestration_index = fenestration_coordinate_centre - reveal_coordinate_0
-    else:  # interior
-        fenestration_index = reveal_coordinate_0 - fenestration_coordinate_centre
+    fenestration_index = frame.get_index(fenestration_xyz_centre, reveal_coordinate_0)
 
     return fenestration_index
 
@@ -120,17 +138,11 @@ def get_fenestration_centre_index(part, fenestration, reveal_coordinate_0):
 def get_fenestration_edge_indexes(fenestration_width, fenestration_centre_index):
     """
     Determine the index of fenestration edges (window & door)
-    :param fenestration_width: window/door width
-    :param fenestration_centre_index: The reveal index of the centre of the window/door
+    :param fenestration_width: window/door width (units)
+    :param fenestration_centre_index: The reveal index of the centre of the window/door (units)
     :return:
     """
-    half_width = fenestration_width / 2
-
-    # establish the edge of windows coordinates
-    left_fenestration_edge_index = fenestration_centre_index + half_width
-    right_fenestration_edge_index = fenestration_centre_index - half_width
-
-    return left_fenestration_edge_index, right_fenestration_edge_index
+    return pl.get_fenestration_edge_indexes(fenestration_width, fenestration_centre_index)
 
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> GET OUT-RANGES
@@ -139,28 +151,18 @@ def get_fenestration_edge_indexes(fenestration_width, fenestration_centre_index)
 def get_fenestration_out_range(fenestration_left_index, fenestration_right_index, displacement):
     """
     Determine the ranges the reveals should not be placed.
-    :param fenestration_left_index: Index of the left edge of the opening
-    :param fenestration_right_index: Index of the right edge of the opening
-    :param displacement: the displacement distance set away from edges of openings
+    :param fenestration_left_index: Index of the left edge of the opening (units)
+    :param fenestration_right_index: Index of the right edge of the opening (units)
+    :param displacement: the displacement distance set away from edges of openings (units)
     This creates the range the reveals cannot be placed
-    :return: list of left/right window range
+    :return: list of left/right window range (units)
     """
 
     # window width
     fenestration_width = fenestration_left_index - fenestration_right_index
     displacement = check_displacement_distance(displacement, fenestration_width)
 
-    # window left edge
-    left_box_range_1 = fenestration_left_index - displacement
-    left_box_range_2 = fenestration_left_index + displacement
-    left_range = [left_box_range_1, left_box_range_2]
-
-    # window right edge
-    right_box_range_1 = fenestration_right_index - displacement
-    right_box_range_2 = fenestration_right_index + displacement
-    right_range = [right_box_range_1, right_box_range_2]
-
-    return left_range, right_range
+    return pl.get_fenestration_out_range(fenestration_left_index, fenestration_right_index, displacement)
 
 
 # get multiple hosted openings out-range per fenestration type
@@ -170,16 +172,16 @@ def get_hosted_fenestrations_out_range(part, hosted_fenestrations, reveal_coordi
     :param part: the part being panelized
     :param hosted_fenestrations: all hosted fenestrations
     :param reveal_coordinate_0: coordinates of reveal at 0
-    :param displacement: the displacement distance set away from edges of openings
-    :return: list of all out_ranges
+    :param displacement: the displacement distance set away from edges of openings (units)
+    :return: list of all out_ranges (units)
     """
     out_ranges = []
 
     # loop through each window
     for fenestration in hosted_fenestrations:
         # determine the window center index of each window
-        fenestration_center_index = get_fenestration_centre_index(part, fenestration, reveal_coordinate_0)
-        fenestration_width = get_fenestration_width(fenestration.Id)
+        fenestration_center_index = pl.to_units(get_fenestration_centre_index(part, fenestration, reveal_coordinate_0))
+        fenestration_width = pl.to_units(get_fenestration_width(fenestration.Id))
 
         # determine the out-range for each window
         fenestration_left_index, fenestration_right_index = get_fenestration_edge_indexes \
@@ -203,8 +205,8 @@ def get_out_ranges(part, hosted_doors, hosted_windows, reveal_coordinate_0, disp
     :param hosted_doors: Hosted doors in a part host wall
     :param hosted_windows: Hosted windows in a part host wall
     :param reveal_coordinate_0: Coordinates of reveal at 0
-    :param displacement: Displacement distance from edges of fenestration
-    :return: list of all out ranges
+    :param displacement: Displacement distance from edges of fenestration (units)
+    :return: list of all out ranges (units)
     """
     # when a part has both doors and windows
     if len(hosted_doors) != 0 and len(hosted_windows) != 0:
@@ -228,46 +230,22 @@ def get_out_ranges(part, hosted_doors, hosted_windows, reveal_coordinate_0, disp
 def check_out_range(edge, out_ranges, exterior=True):
     """
     Checks if the edge(reveal index) is within the outrange, if within the out range it defaults to the edge of the outrange
-    :param edge: right/left edge
-    :param out_ranges: the index ranges to be skipped
+    :param edge: right/left edge (units)
+    :param out_ranges: the index ranges to be skipped (units)
     :param exterior: if exterior or interior
     :return: the new reveal position
     """
-
-    if exterior:
-        # skipping the out_range
-        # _____________________________________________________________________
-        for edge_range in out_ranges:
-            edge_range = sorted(edge_range)  # sort to determine the smallest
-            if edge_range[0] <= edge <= edge_range[1]:  # the range the reveal should not fall within
-                if edge_range[0] > edge:
-                    edge = edge_range[0]  # because we are moving left to right, the greatest value is the smallest
-                elif edge_range[1] > edge:
-                    edge = edge_range[1]
-        # _____________________________________________________________________
-    else:
-        # skipping the out_range
-        # _____________________________________________________________________
-        for edge_range in out_ranges:
-            if edge_range[0] <= edge <= edge_range[1]:
-                if edge_range[0] < edge:
-                    edge = edge_range[0]
-                elif edge_range[1] < edge:
-                    edge = edge_range[1]
-        # _____________________________________________________________________
-
-    return edge
+    return pl.check_out_range(edge, out_ranges, exterior)
 
 
 def check_displacement_distance(displacement_distance, fenestration_width):
     """
     Check if displacement distance surpasses the centre of the opening
-    :param displacement_distance:
-    :param fenestration_width:
+    :param displacement_distance: (units)
+    :param fenestration_width: (units)
     :return:
     """
-    limit = fenestration_width / 2
-    if displacement_distance >= limit:
-        displacement_distance = limit - 0.5
+    displacement_distance, clamped = pl.clamp_displacement_distance(displacement_distance, fenestration_width)
+    if clamped:
         forms.alert("The displacement distance set is beyond half width fenestration limit")
     return displacement_distance
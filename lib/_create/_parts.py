@@ -12,11 +12,17 @@ import clr
 
 clr.AddReference("System")
 
+from array import array
+from System.Collections.Generic import List
+
 from _create import _transactions as a
 from _create import _test as tt
 from _create import _coordinate as c
 from _create import _openings as o
 from _create import _errorhandler as eh
+from _create import _planner as pl
+from _create import _registry as r
+from _create import _rules as ru
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
 
@@ -26,6 +32,15 @@ uidoc = __revit__.ActiveUIDocument  # obj that represent the current active proj
 
 rvt_year = int(app.VersionNumber)
 
+panel_specs = {}  # panel specification per document
+part_tables = {}  # part table per document
+
+# element id values are 64-bit from Revit 2024, "q" is not available to every interpreter
+try:
+    id_typecode = array("q").typecode
+except ValueError:
+    id_typecode = "l"
+
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VIEWS
 active_view = doc.ActiveView
 active_level = doc.ActiveView.GenLevel
@@ -33,13 +48,23 @@ active_level = doc.ActiveView.GenLevel
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> SELECT FUNCTIONS
 
-def select_all_parts():
+def select_all_parts(length_class=None, layer_indexes=None):
     """
-    Selects all parts in a active project
+    Selects all parts in a active project, the criteria are evaluated by Revit before the parts are returned
+    :param length_class: -1 underpanelized, 0 panelized, 1 unpanelized parts only, all parts if None
+    :param layer_indexes: collection of layer indexes of the parts, all layers if None
     :return: A collection of all parts
     """
-    all_parts = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Parts). \
-        WhereElementIsNotElementType().ToElements()
+    collector = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Parts).WhereElementIsNotElementType()
+
+    if length_class is not None:
+        collector = collector.WherePasses(get_length_filter(length_class, get_panel_spec()))
+    if layer_indexes is not None:
+        if len(layer_indexes) == 0:
+            return []
+        collector = collector.WherePasses(get_layer_index_filter(layer_indexes))
+
+    all_parts = collector.ToElements()
 
     return all_parts
 
@@ -70,8 +95,67 @@ def select_parts():
     return parts
 
 
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> FILTER FUNCTIONS
+
+def get_length_filter(length_class, panel_spec):
+    """
+    Parameter filter of parts by length, matching classify_part_length: lengths are rounded to units,
+    thus the limits are set half a unit beyond them
+    :param length_class: -1 underpanelized, 0 panelized, 1 unpanelized
+    :param panel_spec: PanelSpec
+    :return: ElementParameterFilter
+    """
+    length_id = ElementId(BuiltInParameter.DPART_LENGTH_COMPUTED)
+    epsilon = 1e-9
+    maximum = (panel_spec.maximum_panel + pl.length_tolerance + 0.5) / pl.units_per_foot
+    minimum = (panel_spec.minimum_panel - pl.length_tolerance - 0.5) / pl.units_per_foot
+
+    rules = List[FilterRule]()
+    if length_class > 0:
+        rules.Add(ParameterFilterRuleFactory.CreateGreaterOrEqualRule(length_id, maximum, epsilon))
+    elif length_class < 0:
+        rules.Add(ParameterFilterRuleFactory.CreateLessRule(length_id, minimum, epsilon))
+    else:
+        rules.Add(ParameterFilterRuleFactory.CreateGreaterOrEqualRule(length_id, minimum, epsilon))
+        rules.Add(ParameterFilterRuleFactory.CreateLessRule(length_id, maximum, epsilon))
+
+    return ElementParameterFilter(rules)
+
+
+def get_layer_index_filter(layer_indexes):
+    """
+    Parameter filter of parts by layer index
+    :param layer_indexes: collection of layer indexes
+    :return: ElementParameterFilter, LogicalOrFilter of them for many layer indexes
+    """
+    layer_index_id = ElementId(BuiltInParameter.DPART_LAYER_INDEX)
+
+    filters = List[ElementFilter]()
+    for layer_index in layer_indexes:
+        # the layer index is a string parameter, case sensitivity is dropped from string rules in Revit 2022
+        if rvt_year >= 2022:
+            rule = ParameterFilterRuleFactory.CreateEqualsRule(layer_index_id, str(layer_index))
+        else:
+            rule = ParameterFilterRuleFactory.CreateEqualsRule(layer_index_id, str(layer_index), True)
+        filters.Add(ElementParameterFilter(rule))
+
+    if filters.Count == 1:
+        return filters[0]
+    return LogicalOrFilter(filters)
+
+
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> GET ELEMENT ID FUNCTIONS
 
+def get_element_id_value(element_id):
+    """
+    Abstract the integer value of an element id
+    :param element_id: element id
+    :return: integer value
+    """
+    if rvt_year >= 2024:
+        return element_id.Value
+    return element_id.IntegerValue
+
 
 def get_host_wall_id(part):
     """
@@ -115,45 +199,45 @@ def get_layer_index(part):
     return layer_index
 
 
-def get_wall_sweep_parameters(layer_index, host_wall_type_id):
-    """Abstract parameters based on the layer index of the part"""
-
-    left_lap_id = ElementId(352818)
-    right_lap_id = ElementId(352808)
+def get_wall_type_rule(layer_index, host_wall_type_id):
+    """
+    Abstract the rule of the layer of a part, as per the rules of the host wall type, without the lap types
+    :param layer_index: layer index of the part
+    :param host_wall_type_id: host wall type id
+    :return: lap (left/right), side (Exterior/Interior), exterior (None for parts neither exterior nor interior)
+    """
+    # wall type rules resolved for the document
+    return ru.get_wall_type_rule(r.get_registry().wall_type_rules, get_element_id_value(host_wall_type_id),
+                                 layer_index)
 
-    # default setting for exterior
-    side_of_wall = WallSide.Exterior
-    lap_type_id = right_lap_id
-    exterior = True
 
-    # collection of walls with interior and exterior parts
-    I_E_wall_types = [ElementId(384173), ElementId(391917), ElementId(391949), ElementId(391949), ElementId(391971)]
+def get_wall_sweep_parameters(layer_index, host_wall_type_id):
+    """
+    Abstract parameters based on the layer index of the part, as per the rules of the host wall type
+    :param layer_index: layer index of the part
+    :param host_wall_type_id: host wall type id
+    :return: lap type id, side of wall, exterior (None for parts neither exterior nor interior)
+    """
+    lap, side, exterior = get_wall_type_rule(layer_index, host_wall_type_id)
 
-    # collection of walls with interior parts
-    I_wall_types = [ElementId(400084)]
+    # lap types resolved for the document, raises LapTypeNotFoundError if not found
+    lap_type_id = ElementId(r.get_lap_type_id(lap))
 
-    # if wall types have both  the interior and exterior parts
-    if host_wall_type_id not in I_wall_types:
-        if layer_index == 1:  # exterior face
-            side_of_wall = WallSide.Exterior
-            lap_type_id = right_lap_id
-            exterior = True
+    if side == "Interior":
+        side_of_wall = WallSide.Interior
+    else:
+        side_of_wall = WallSide.Exterior
 
-        elif layer_index == 3:  # interior face
-            side_of_wall = WallSide.Interior
-            lap_type_id = left_lap_id
-            exterior = False
-        else:
-            exterior = None
+    return lap_type_id, side_of_wall, exterior
 
-    # if wall types has interior part only
-    elif host_wall_type_id in I_wall_types:
-        if layer_index == 2:  # interior face of partition walls, ignore layer-index 1 (the core)
-            side_of_wall = WallSide.Interior
-            lap_type_id = left_lap_id
-            exterior = False
 
-    return lap_type_id, side_of_wall, exterior
+def get_panelized_layer_indexes(exteriors=(True, False)):
+    """
+    Abstract the layer indexes of the parts panelized, as per the rules of the wall types of the document
+    :param exteriors: directions of the parts, True exterior, False interior
+    :return: collection of layer indexes, None for any layer index
+    """
+    return ru.get_layer_indexes(r.get_registry().wall_type_rules, exteriors)
 
 
 def create_reveal(host_wall_id, lap_type_id, variable_distance, side_of_wall):
@@ -207,17 +291,11 @@ def get_part_centre_index(part, reveal_plane_coordinate_0):
     """
     # project parameters
     host_wall_id = get_host_wall_id(part)
-    x_axis_plane = c.determine_x_plane(host_wall_id)
+    frame = c.get_wall_frame(host_wall_id)  # frame shared with the wall's other parts and openings
 
-    # determine the coordinates of the centre of the part
+    # the distance between the centre of the part and the reveal at 0 is the centre-index
     part_centre_xyz_coordinates = c.get_bounding_box_center(part)
-    part_centre_coordinate = float(c.get_plane_coordinate(part_centre_xyz_coordinates, x_axis_plane))
-
-    # determine the difference between two to abstract the centre-index
-    if reveal_plane_coordinate_0 > part_centre_coordinate:
-        centre_index = (reveal_plane_coordinate_0 - part_centre_coordinate)
-    else:
-        centre_index = (part_centre_coordinate - reveal_plane_coordinate_0)
+    centre_index = frame.get_index(part_centre_xyz_coordinates, reveal_plane_coordinate_0)
 
     return centre_index
 
@@ -225,120 +303,215 @@ def get_part_centre_index(part, reveal_plane_coordinate_0):
 def get_part_edge_index(part_length, part_centre_index):
     """
     Determine the left or the right edge
-    :param part_length: Length of part
-    :param part_centre_index: Index of part centre
+    :param part_length: Length of part (units)
+    :param part_centre_index: Index of part centre (units)
     :return: left_edge, right_edge
     """
-    half_length = part_length / 2
-    edge_1 = part_centre_index + half_length
-    edge_2 = part_centre_index - half_length
-
-    edges = sorted([edge_1, edge_2])
-
-    right_edge = edges[0]  # the smallest value becomes the right-edge,
-    # the distance 0 begins at the right end of the wall's path curve
-    left_edge = edges[1]  # the largest value becomes the left edge
+    return pl.get_part_edge_index(part_length, part_centre_index)
 
-    return left_edge, right_edge
 
-
-def get_reveal_indexes(left_edge, right_edge, out_ranges, exterior=True):
+def get_reveal_indexes(left_edge, right_edge, out_ranges, exterior=True, optimal=False):
     """
     Retrieve the reveal indexes, taking into consideration the openings out-ranges
-    :param out_ranges: The ranges where the reveals should not be positioned closed to fenestration edges
-    :param left_edge: The left edge of the part ( from exterior)
-    :param right_edge: The right edge of the part ( from exterior)
+    :param out_ranges: The ranges where the reveals should not be positioned closed to fenestration edges (units)
+    :param left_edge: The left edge of the part ( from exterior) (units)
+    :param right_edge: The right edge of the part ( from exterior) (units)
     :param exterior: if exterior face, the panel position starts from left to right,
      if not the panel position starts from right to left
-    :return: collection of indexes of the reveal position
-    """
-
-    # The panelling distance (3' 11 1/8" Distance required to generate a panel of 4')
-    panelling_distance = 3.927083
-
-    if rvt_year >= 2023:  # template provided uses reveal width 15/16"
-        panelling_distance = 3.927083 - 0.005208  # 3' 11 1/8" - 1/16"
-    elif rvt_year <= 2022:  # template provided uses reveal width 7/8"
-        panelling_distance = 3.927083  # 3' 11 1/8"
-
-    # offset reveal width from edge to allow cutting of first panel at 4'
-    if rvt_year <= 2022:  # template provided uses reveal width 7/8"
-        reveal_width = 0.072917
-        right_edge = right_edge + reveal_width
-    elif rvt_year >= 2023:  # template provided uses reveal width 15/16"
-        reveal_width = 0.039063
-        right_edge = right_edge + reveal_width
-        left_edge = left_edge - reveal_width
-
-    # minimum panel when panelizing
-    minimum_panel = 2
-
-    # store all reveal indexes
-    reveal_indexes = []
-
-    # determine reveals required to panelize part
-    while True:
-        reveal_edge_width = 0.078125  # subtracted 15/16"from panel to allow it cut at 2'
-        if exterior:  # panelization is left to right, the left edge reduces towards the right edge
-            left_edge -= panelling_distance
-            # skipping the out range if there is a window
-            left_edge = o.check_out_range(left_edge, out_ranges, exterior=True)
-
-            # the new left edge appended to the list
-            reveal_indexes.append(left_edge)
-
-            # remaining length established,this will determine when panelization is complete ( < 4 script breaks)
-            rem_length = left_edge - (right_edge - reveal_edge_width)
-
-            if rem_length < 4.0000:
-                if rem_length < minimum_panel:
-                    # remove the last record on list to allow for further splitting
-                    del reveal_indexes[-1]
-                    # the new left edge becomes the last item on list after deleting the last reveal
-                    if len(reveal_indexes) != 0:
-                        left_edge = reveal_indexes[-1]
-
-                    # the part left behind is determined
-                    part_left_behind = left_edge - right_edge
-                    # determine the remainder left edge position
-                    # what remains after setting aside minimum panel
-                    rem = part_left_behind - (minimum_panel - reveal_edge_width)
-                    # position the new left edge
-                    left_edge -= rem
-                    reveal_indexes.append(left_edge)
-                    # the script now ends
-                    break
-                else:
-                    # the script now ends
-                    break
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces
+    :return: collection of indexes of the reveal position (units)
+    """
+    return pl.get_reveal_indexes(left_edge, right_edge, out_ranges, get_panel_spec(), exterior, optimal)
+
+
+def plan_reveal_indexes(part_length, part_centre_index, out_ranges, exterior=True, multiple=True, optimal=False):
+    """
+    Plan the reveal indexes of a part, identical part geometries are served from the plan cache
+    :param part_length: Length of part (units)
+    :param part_centre_index: Index of part centre (units)
+    :param out_ranges: The ranges where the reveals should not be positioned closed to fenestration edges (units)
+    :param exterior: direction of panelization, left to right (True) or right to left (False)
+    :param multiple: Bool to determine single panel or multi-panel reveal distances
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces
+    :return: collection of indexes of the reveal position (units)
+    """
+    return pl.plan_reveal_indexes(part_length, part_centre_index, out_ranges, get_panel_spec(), exterior, multiple,
+                                  optimal)
+
+
+def get_single_panel_reveal_indexes(left_edge, right_edge, exterior=True):
+    """
+    Determine the position of a reveal index for a single panel
+    :param left_edge: left edge reveal index (units)
+    :param right_edge: right edge reveal index (units)
+    :param exterior: if part exterior or not
+    :return: reveal index position to form a panel (units)
+    """
+    return pl.get_single_panel_reveal_indexes(left_edge, right_edge, get_panel_spec(), exterior)
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PANEL SPECIFICATION FUNCTIONS
+
+def get_reveal_width(lap_type_id, document=doc):
+    """
+    Abstract the width of the reveal cut by a lap type, from the type or its profile
+    :param lap_type_id: reveal (wall sweep) type id
+    :param document: Revit document
+    :return: reveal width (units), None if the width is not set on the type or its profile
+    """
+    lap_type = document.GetElement(lap_type_id)
+    if lap_type is None:
+        return None
+
+    width_parameter = lap_type.LookupParameter("Width")
+    if width_parameter is None:
+        profile_parameter = lap_type.LookupParameter("Profile")
+        if profile_parameter is None:
+            return None
+        profile = document.GetElement(profile_parameter.AsElementId())
+        if profile is None:
+            return None
+        width_parameter = profile.LookupParameter("Width")
+
+    if width_parameter is None or width_parameter.AsDouble() <= 0:
+        return None
+
+    return pl.to_units(width_parameter.AsDouble())
+
+
+def get_panel_spec(document=doc):
+    """
+    Resolve the panel specification of a document once, from the width of the reveal type,
+    with the Revit version of the template as the fallback
+    :param document: Revit document
+    :return: PanelSpec
+    """
+    key = document.PathName or document.Title
+    panel_spec = panel_specs.get(key)
+    if panel_spec is None:
+        try:
+            reveal_width = get_reveal_width(ElementId(r.get_lap_type_id("right", document)), document)
+        except eh.LapTypeNotFoundError:
+            # the takeoff and highlights classify parts by length without the lap types
+            reveal_width = None
+
+        if reveal_width is None:
+            panel_spec = pl.get_panel_spec(rvt_year)
         else:
-            right_edge += panelling_distance  # panelization is right to left, the right edge increases towards the left edge
-            # skipping the out range if there is a window
-            right_edge = o.check_out_range(right_edge, out_ranges, exterior=False)
+            panel_spec = pl.get_panel_spec_from_reveal_width(reveal_width)
+        panel_specs[key] = panel_spec
 
-            reveal_indexes.append(right_edge)
+    return panel_spec
 
-            # reveal edge width subtracted from the right edge , to factor a 4' panel
-            rem_length = left_edge - (right_edge - reveal_edge_width)
 
-            if rem_length < 4.0000:
-                if rem_length < minimum_panel:
-                    # remove the last record on list to allow for further splitting
-                    del reveal_indexes[-1]
-                    if len(reveal_indexes) != 0:
-                        right_edge = reveal_indexes[-1]  # the right edge becomes the last item on list
-                    part_left_behind = left_edge - right_edge
-                    rem = part_left_behind - (minimum_panel - reveal_edge_width)
-                    right_edge += rem
-                    reveal_indexes.append(right_edge)
-                    break
-                else:
-                    break
+def clear_panel_specs():
+    """Clear the panel specifications, resolved again on the next run"""
+    panel_specs.clear()
 
-    return reveal_indexes
 
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PART TABLE
 
+class PartTable(object):
+    """
+    Snapshot of the parts of a document, read from the model once.
+    Each part is a row of parallel arrays, element ids as integers, lengths and heights in units, areas in square
+    feet, sides 1 exterior, 0 interior, -1 neither (core)
+    """
 
+    def __init__(self):
+        self.parts = []
+        self.rows = {}  # part id -> row
+        self.part_ids = array(id_typecode)
+        self.host_wall_ids = array(id_typecode)
+        self.wall_type_ids = array(id_typecode)
+        self.layer_indexes = array("b")
+        self.lengths = array("l")
+        self.heights = array("l")
+        self.areas = array("d")
+        self.sides = array("b")
+
+    def __len__(self):
+        return len(self.parts)
+
+    def add_part(self, part, host_wall_type_ids=None):
+        """
+        Read a part from the model into a new row
+        :param part: part
+        :param host_wall_type_ids: wall type id per host wall id read earlier in the pass, optional
+        :return: row
+        """
+        host_wall_id = get_host_wall_id(part)
+        if host_wall_type_ids is None:
+            host_wall_type_id = get_host_wall_type_id(host_wall_id)
+        else:
+            # the parts of a wall share its type, the wall is read once per pass
+            host_wall_type_id = host_wall_type_ids.get(host_wall_id)
+            if host_wall_type_id is None:
+                host_wall_type_id = get_host_wall_type_id(host_wall_id)
+                host_wall_type_ids[host_wall_id] = host_wall_type_id
+        layer_index = get_layer_index(part)
+        # the side is read from the wall type rules, the table does not depend on the lap types
+        lap, side, exterior = get_wall_type_rule(layer_index, host_wall_type_id)
+
+        row = len(self.parts)
+        self.parts.append(part)
+        self.rows[part.Id] = row
+        self.part_ids.append(get_element_id_value(part.Id))
+        self.host_wall_ids.append(get_element_id_value(host_wall_id))
+        self.wall_type_ids.append(get_element_id_value(host_wall_type_id))
+        self.layer_indexes.append(layer_index)
+        self.lengths.append(pl.to_units(part.get_Parameter(BuiltInParameter.DPART_LENGTH_COMPUTED).AsDouble()))
+        self.heights.append(pl.to_units(part.get_Parameter(BuiltInParameter.DPART_HEIGHT_COMPUTED).AsDouble()))
+        self.areas.append(part.get_Parameter(BuiltInParameter.DPART_AREA_COMPUTED).AsDouble())
+        self.sides.append(1 if exterior == True else 0 if exterior == False else -1)
+
+        return row
+
+    def get_row(self, part):
+        """
+        Retrieve the row of a part, a part created after the table was built in the run is added to it
+        :param part: part
+        :return: row
+        """
+        row = self.rows.get(part.Id)
+        if row is None:
+            row = self.add_part(part)
+        return row
+
+
+def read_part_table(document=doc):
+    """
+    Read all parts of a document into a part table, in a single collector pass
+    :param document: Revit document
+    :return: PartTable
+    """
+    table = PartTable()
+    host_wall_type_ids = {}
+    for part in FilteredElementCollector(document).OfCategory(BuiltInCategory.OST_Parts). \
+            WhereElementIsNotElementType():
+        table.add_part(part, host_wall_type_ids)
+
+    return table
+
+
+def get_part_table(document=doc):
+    """
+    Retrieve the part table of a document, built for the whole document on the first request of the run
+    :param document: Revit document
+    :return: PartTable
+    """
+    key = document.PathName or document.Title
+    table = part_tables.get(key)
+    if table is None:
+        table = read_part_table(document)
+        part_tables[key] = table
+
+    return table
+
+
+def clear_part_tables():
+    """Clear the part tables, parts are read from the model again on the next request, at the start of each run"""
+    part_tables.clear()
 
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> SORT FUNCTIONS
@@ -351,21 +524,16 @@ def sort_parts_by_side(parts):
     """
     exterior_parts = []
     interior_parts = []
-    core_parts = []
+    table = get_part_table()
+    sides = table.sides
 
     # sorted parts, starting with exterior followed by interior
     for part in parts:
-        host_wall_id = get_host_wall_id(part)
-        host_wall_type_id = get_host_wall_type_id(host_wall_id)
-        layer_index = get_layer_index(part)
-        lap_type_id, side_of_wall, exterior = get_wall_sweep_parameters(layer_index, host_wall_type_id)
-
-        if exterior == True:
+        side = sides[table.get_row(part)]
+        if side == 1:
             exterior_parts.append(part)
-        elif exterior == False:
+        elif side == 0:
             interior_parts.append(part)
-        elif exterior == None:
-            core_parts.append(part)
 
     return exterior_parts, interior_parts
 
@@ -379,15 +547,16 @@ def sort_parts_by_length(parts):
     underpanelized = []
     panalized = []
     unpanalized = []
-
-    minimum_panel = 2.0
+    panel_spec = get_panel_spec()
+    table = get_part_table()
+    lengths = table.lengths
 
     for part in parts:
-        part_length = part.get_Parameter(BuiltInParameter.DPART_LENGTH_COMPUTED).AsDouble()
-        part_length = round(part_length, 2)
-        if part_length > 4.0:
+        # lengths are compared in exact units, within 1/16" of a panel limit is at the limit
+        part_class = pl.classify_part_length(lengths[table.get_row(part)], panel_spec)
+        if part_class > 0:
             unpanalized.append(part)
-        elif part_length < minimum_panel:
+        elif part_class < 0:
             underpanelized.append(part)
         else:
             panalized.append(part)
@@ -0,0 +1,129 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Panelization plan files. Plans are exported to JSON for offline review and replayed later,
+on the same model or a copy of it, without recomputing. Revit-free.
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+import io
+import json
+import numbers
+
+from _create import _planner as pl
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
+
+plan_file_version = 1
+plan_keys = ("part_id", "wall_id", "side", "lap_type_id", "reveal_indexes")
+optional_plan_keys = ("edges",)
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PLAN FILE FUNCTIONS
+
+def dump_plans(plans, document_title=""):
+    """
+    Serialize plans to a JSON string, plans are sorted by wall to be reviewed per wall
+    :param plans: collection of plans
+    :param document_title: title of the document planned
+    :return: JSON string
+    """
+    plans = sorted(plans, key=lambda x: (x["wall_id"], x["side"], x["part_id"]))
+    data = {
+        "version": plan_file_version,
+        "units_per_foot": pl.units_per_foot,
+        "document": document_title,
+        "plans": [dict((key, plan[key]) for key in plan_keys + optional_plan_keys if key in plan) for plan in plans],
+    }
+
+    return json.dumps(data, indent=1, sort_keys=True)
+
+
+def get_plan_integer(value, name):
+    """
+    Validate an integer of a plan file
+    :param value: value read from the plan file
+    :param name: name of the value, reported when invalid
+    :return: int
+    """
+    if isinstance(value, bool) or not isinstance(value, numbers.Integral):
+        raise ValueError("Invalid plan {}: {!r}".format(name, value))
+
+    return int(value)
+
+
+def get_plan_integers(values, name, count=None):
+    """
+    Validate a list of integers of a plan file
+    :param values: values read from the plan file
+    :param name: name of the values, reported when invalid
+    :param count: number of values expected, any number if None
+    :return: list of int
+    """
+    if not isinstance(values, list) or (count is not None and len(values) != count):
+        raise ValueError("Invalid plan {}: {!r}".format(name, values))
+
+    return [get_plan_integer(x, name) for x in values]
+
+
+def load_plans(text):
+    """
+    Deserialize plans from a JSON string
+    :param text: JSON string
+    :return: collection of plans, title of the document planned
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("Invalid plan file: {!r}".format(type(data)))
+    if data.get("version") != plan_file_version:
+        raise ValueError("Unsupported plan file version: {}".format(data.get("version")))
+    if data.get("units_per_foot") != pl.units_per_foot:
+        raise ValueError("Plan file units do not match: {}".format(data.get("units_per_foot")))
+
+    plan_data = data.get("plans", [])
+    if not isinstance(plan_data, list):
+        raise ValueError("Invalid plans: {!r}".format(plan_data))
+
+    plans = []
+    for plan in plan_data:
+        if not isinstance(plan, dict) or any(key not in plan for key in plan_keys) \
+                or plan["side"] not in ("Exterior", "Interior"):
+            raise ValueError("Invalid plan: {!r}".format(plan))
+        plans.append({
+            "part_id": get_plan_integer(plan["part_id"], "part_id"),
+            "wall_id": get_plan_integer(plan["wall_id"], "wall_id"),
+            "side": plan["side"],
+            "lap_type_id": get_plan_integer(plan["lap_type_id"], "lap_type_id"),
+            "reveal_indexes": get_plan_integers(plan["reveal_indexes"], "reveal_indexes"),
+            "edges": get_plan_integers(plan["edges"], "edges", 2) if plan.get("edges") is not None else None,
+        })
+
+    document_title = data.get("document", "")
+    if not isinstance(document_title, type(u"")) and not isinstance(document_title, str):
+        raise ValueError("Invalid plan document: {!r}".format(document_title))
+
+    return plans, document_title
+
+
+def export_plans(file_path, plans, document_title=""):
+    """
+    Export plans to a JSON plan file
+    :param file_path: plan file path
+    :param plans: collection of plans
+    :param document_title: title of the document planned
+    :return: None
+    """
+    with io.open(file_path, "w", encoding="utf-8") as plan_file:
+        plan_file.write(u"" + dump_plans(plans, document_title))
+
+
+def import_plans(file_path):
+    """
+    Import plans from a JSON plan file
+    :param file_path: plan file path
+    :return: collection of plans, title of the document planned
+    """
+    with io.open(file_path, "r", encoding="utf-8") as plan_file:
+        return load_plans(plan_file.read())
@@ -0,0 +1,756 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Panel planning core. Pure arithmetic on plain integers and tuples, free of Revit, pyRevit and the active document,
+thus it can be imported, run and benchmarked outside Revit (CPython/IronPython).
+
+All indexes are distances along the wall's path curve, measured from the reveal at 0. Lengths and indexes are
+integer units of 1/256", exact and deterministic, converted to feet only where reveals are created in Revit.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+
+units_per_foot = 3072  # lengths are integer units of 1/256"
+
+standard_panel = 12288  # 4' panel, panelization is complete once the remaining length is below it
+standard_minimum_panel = 6144  # 2' minimum panel when panelizing
+standard_reveal_edge_width = 240  # subtracted 15/16"from panel to allow it cut at 2'
+length_tolerance = 16  # 1/16", lengths within it of a panel limit are at the limit
+maximum_candidates = 2000  # bound on candidate reveals per part, beyond it the optimal layout is not attempted
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> UNITS
+
+def to_units(feet):
+    """
+    Convert a length in feet (Revit internal units) to integer units of 1/256"
+    :param feet: length in feet
+    :return: length in units
+    """
+    return int(round(feet * units_per_foot))
+
+
+def to_feet(units):
+    """
+    Convert a length in integer units of 1/256" to feet (Revit internal units)
+    :param units: length in units
+    :return: length in feet
+    """
+    return units / units_per_foot
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PANEL SPECIFICATION
+
+class PanelSpec(namedtuple("PanelSpec", ["reveal_width", "panelling_distance", "right_offset", "left_offset",
+                                         "reveal_edge_width", "minimum_panel", "maximum_panel"])):
+    """
+    Immutable panel specification (units), resolved once per document and shared by planning and takeoff
+    reveal_width: width of the reveal (lap) cut between panels
+    panelling_distance: distance between reveals generating a 4' panel
+    right_offset, left_offset: offsets of the part edges allowing the first panel to be cut at 4'
+    reveal_edge_width: width subtracted from a panel to allow it to be cut at the minimum panel
+    minimum_panel, maximum_panel: panel limits
+    """
+    __slots__ = ()
+
+
+# template reveal profiles not centred on the reveal distance, keyed by reveal width (units)
+template_panel_specs = {
+    # 7/8" profile of the templates before 2023, panelling distance 3' 11 1/8", offset on the right edge only
+    224: PanelSpec(224, 12064, 224, 0, standard_reveal_edge_width, standard_minimum_panel, standard_panel),
+}
+
+
+def get_panel_spec_from_reveal_width(reveal_width):
+    """
+    Establish the panel specification from the width of the reveal cut between panels
+    :param reveal_width: reveal width (units)
+    :return: PanelSpec
+    """
+    panel_spec = template_panel_specs.get(reveal_width)
+    if panel_spec is not None:
+        return panel_spec
+
+    # the reveal is centred on its distance, the reveal width is offset from both edges
+    right_offset = reveal_width - reveal_width // 2
+    return PanelSpec(reveal_width, standard_panel - reveal_width, right_offset, reveal_width - right_offset,
+                     standard_reveal_edge_width, standard_minimum_panel, standard_panel)
+
+
+def get_panel_spec(rvt_year):
+    """
+    Establish the panel specification of the template provided for a Revit version,
+    the fallback when the reveal width cannot be read from the model
+    :param rvt_year: Revit version number i.e. 2023
+    :return: PanelSpec
+    """
+    if rvt_year >= 2023:  # template provided uses reveal width 15/16"
+        return get_panel_spec_from_reveal_width(240)  # panelling distance 3' 11 1/8" - 1/16"
+
+    return get_panel_spec_from_reveal_width(224)  # template provided uses reveal width 7/8"
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> LENGTH CLASSIFICATION
+
+def classify_part_length(part_length, panel_spec):
+    """
+    Classify a part by its length against the panel limits, lengths within 1/16" of a limit are at the limit
+    :param part_length: Length of part (units)
+    :param panel_spec: PanelSpec
+    :return: -1 underpanelized (below minimum panel), 0 panelized, 1 unpanelized (above a 4' panel)
+    """
+    if part_length > panel_spec.maximum_panel + length_tolerance:
+        return 1
+    if part_length < panel_spec.minimum_panel - length_tolerance:
+        return -1
+    return 0
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> EDGE INDEXES
+
+def get_part_edge_index(part_length, part_centre_index):
+    """
+    Determine the left or the right edge
+    :param part_length: Length of part
+    :param part_centre_index: Index of part centre
+    :return: left_edge, right_edge
+    """
+    # the smallest value becomes the right-edge, the distance 0 begins at the right end of the wall's path curve
+    right_edge = part_centre_index - abs(part_length) // 2
+    # the largest value becomes the left edge, exactly a part length away
+    left_edge = right_edge + abs(part_length)
+
+    return left_edge, right_edge
+
+
+def get_fenestration_edge_indexes(fenestration_width, fenestration_centre_index):
+    """
+    Determine the index of fenestration edges (window & door)
+    :param fenestration_width: window/door width
+    :param fenestration_centre_index: The reveal index of the centre of the window/door
+    :return: left edge index, right edge index
+    """
+    # establish the edge of windows coordinates
+    right_fenestration_edge_index = fenestration_centre_index - fenestration_width // 2
+    left_fenestration_edge_index = right_fenestration_edge_index + fenestration_width
+
+    return left_fenestration_edge_index, right_fenestration_edge_index
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> OUT-RANGES
+
+def clamp_displacement_distance(displacement_distance, fenestration_width):
+    """
+    Limit the displacement distance so that it does not surpass the centre of the opening
+    :param displacement_distance: the displacement distance set away from edges of openings
+    :param fenestration_width: window/door width
+    :return: displacement distance, bool if it was clamped
+    """
+    limit = fenestration_width // 2
+    if displacement_distance >= limit:
+        return limit - 1536, True  # 6" short of the centre
+    return displacement_distance, False
+
+
+def get_fenestration_out_range(fenestration_left_index, fenestration_right_index, displacement):
+    """
+    Determine the ranges the reveals should not be placed.
+    :param fenestration_left_index: Index of the left edge of the opening
+    :param fenestration_right_index: Index of the right edge of the opening
+    :param displacement: the displacement distance set away from edges of openings
+    :return: left/right window range
+    """
+    fenestration_width = fenestration_left_index - fenestration_right_index
+    displacement, clamped = clamp_displacement_distance(displacement, fenestration_width)
+
+    left_range = [fenestration_left_index - displacement, fenestration_left_index + displacement]
+    right_range = [fenestration_right_index - displacement, fenestration_right_index + displacement]
+
+    return left_range, right_range
+
+
+def merge_out_ranges(out_ranges):
+    """
+    Normalize out-ranges into sorted, disjoint intervals. Overlapping or touching ranges are merged.
+    :param out_ranges: the index ranges to be skipped, in any order
+    :return: out-range index: sorted list of range starts, list of matching range ends
+    """
+    starts = []
+    ends = []
+    for edge_range in sorted(sorted(edge_range) for edge_range in out_ranges):
+        if len(starts) != 0 and edge_range[0] <= ends[-1]:
+            ends[-1] = max(ends[-1], edge_range[1])
+        else:
+            starts.append(edge_range[0])
+            ends.append(edge_range[1])
+
+    return starts, ends
+
+
+def skip_out_range(edge, out_range_index, exterior=True, previous_edge=None):
+    """
+    Move the edge (reveal index) out of the out-range it falls in, in a single step.
+    The edge moves back towards the previous reveal, making the panel shorter, unless that would not advance past the
+    previous reveal, then it moves across the out-range.
+    :param edge: right/left edge
+    :param out_range_index: sorted, disjoint out-ranges as returned by merge_out_ranges
+    :param exterior: if exterior (reveals move left to right, decreasing) or interior (increasing)
+    :param previous_edge: the previous reveal index
+    :return: the new reveal position
+    """
+    starts, ends = out_range_index
+    i = bisect_right(starts, edge) - 1
+    if i < 0 or edge > ends[i]:
+        return edge
+
+    if exterior:
+        edge = ends[i]
+        if previous_edge is not None and edge >= previous_edge:
+            edge = starts[i]
+    else:
+        edge = starts[i]
+        if previous_edge is not None and edge <= previous_edge:
+            edge = ends[i]
+
+    return edge
+
+
+def check_out_range(edge, out_ranges, exterior=True):
+    """
+    Checks if the edge(reveal index) is within the outrange, if within the out range it defaults to the edge of the outrange
+    :param edge: right/left edge
+    :param out_ranges: the index ranges to be skipped
+    :param exterior: if exterior or interior
+    :return: the new reveal position
+    """
+    return skip_out_range(edge, merge_out_ranges(out_ranges), exterior)
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> REVEAL INDEXES
+
+def get_reveal_indexes(left_edge, right_edge, out_ranges, panel_spec, exterior=True, optimal=False):
+    """
+    Retrieve the reveal indexes, taking into consideration the openings out-ranges
+    :param left_edge: The left edge of the part ( from exterior)
+    :param right_edge: The right edge of the part ( from exterior)
+    :param out_ranges: The ranges where the reveals should not be positioned closed to fenestration edges
+    :param panel_spec: PanelSpec
+    :param exterior: if exterior face, the panel position starts from left to right,
+     if not the panel position starts from right to left
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces instead of the greedy one
+    :return: collection of indexes of the reveal position
+    """
+    # parts without openings have a closed-form layout, the step-by-step walk is only needed to skip out-ranges
+    if len(out_ranges) == 0:
+        return get_uniform_reveal_indexes(left_edge, right_edge, panel_spec, exterior)
+
+    if optimal:
+        reveal_indexes = get_optimal_reveal_indexes(left_edge, right_edge, out_ranges, panel_spec, exterior)
+        if reveal_indexes is not None:
+            return reveal_indexes
+
+    return iterate_reveal_indexes(left_edge, right_edge, out_ranges, panel_spec, exterior)
+
+
+def get_uniform_reveal_indexes(left_edge, right_edge, panel_spec, exterior=True):
+    """
+    Retrieve the reveal indexes of a part without openings in closed form.
+    Reveals are placed a panelling distance apart from the starting edge, the last one is set back to leave a minimum
+    panel when the remaining length is below it.
+    :param left_edge: The left edge of the part ( from exterior)
+    :param right_edge: The right edge of the part ( from exterior)
+    :param panel_spec: PanelSpec
+    :param exterior: if exterior face, the panel position starts from left to right,
+     if not the panel position starts from right to left
+    :return: collection of indexes of the reveal position
+    """
+    panelling_distance = panel_spec.panelling_distance
+    reveal_edge_width = panel_spec.reveal_edge_width
+    minimum_panel = panel_spec.minimum_panel
+    maximum_panel = panel_spec.maximum_panel
+
+    # offset reveal width from edge to allow cutting of first panel at 4'
+    right_edge = right_edge + panel_spec.right_offset
+    left_edge = left_edge - panel_spec.left_offset
+
+    # the remaining length after n reveals is span - n * panelling distance, in either direction
+    span = left_edge - (right_edge - reveal_edge_width)
+
+    # the number of reveals is the first n leaving less than a 4' panel
+    count = max(1, (span - maximum_panel) // panelling_distance + 1)
+
+    if exterior:
+        reveal_indexes = [left_edge - n * panelling_distance for n in range(1, count + 1)]
+    else:
+        reveal_indexes = [right_edge + n * panelling_distance for n in range(1, count + 1)]
+
+    # the last reveal is set back to leave a minimum panel at the end
+    if span - count * panelling_distance < minimum_panel:
+        if exterior:
+            reveal_indexes[-1] = right_edge + (minimum_panel - reveal_edge_width)
+        else:
+            reveal_indexes[-1] = left_edge - (minimum_panel - reveal_edge_width)
+
+    return reveal_indexes
+
+
+def iterate_reveal_indexes(left_edge, right_edge, out_ranges, panel_spec, exterior=True):
+    """
+    Retrieve the reveal indexes step by step, skipping the openings out-ranges
+    :param left_edge: The left edge of the part ( from exterior)
+    :param right_edge: The right edge of the part ( from exterior)
+    :param out_ranges: The ranges where the reveals should not be positioned closed to fenestration edges
+    :param panel_spec: PanelSpec
+    :param exterior: if exterior face, the panel position starts from left to right,
+     if not the panel position starts from right to left
+    :return: collection of indexes of the reveal position
+    """
+    panelling_distance = panel_spec.panelling_distance
+    reveal_edge_width = panel_spec.reveal_edge_width
+    minimum_panel = panel_spec.minimum_panel
+    maximum_panel = panel_spec.maximum_panel
+
+    # offset reveal width from edge to allow cutting of first panel at 4'
+    right_edge = right_edge + panel_spec.right_offset
+    left_edge = left_edge - panel_spec.left_offset
+
+    # out-ranges are normalized once per part
+    out_range_index = merge_out_ranges(out_ranges)
+
+    # store all reveal indexes
+    reveal_indexes = []
+
+    # determine reveals required to panelize part
+    while True:
+        if exterior:  # panelization is left to right, the left edge reduces towards the right edge
+            previous_edge = left_edge
+            left_edge -= panelling_distance
+            # skipping the out range if there is a window
+            left_edge = skip_out_range(left_edge, out_range_index, True, previous_edge)
+
+            # the new left edge appended to the list
+            reveal_indexes.append(left_edge)
+
+            # remaining length established,this will determine when panelization is complete ( < 4 script breaks)
+            rem_length = left_edge - (right_edge - reveal_edge_width)
+
+            if rem_length < maximum_panel:
+                if rem_length < minimum_panel:
+                    # remove the last record on list to allow for further splitting
+                    del reveal_indexes[-1]
+                    # the new left edge becomes the last item on list after deleting the last reveal
+                    if len(reveal_indexes) != 0:
+                        left_edge = reveal_indexes[-1]
+
+                    # the part left behind is determined
+                    part_left_behind = left_edge - right_edge
+                    # what remains after setting aside minimum panel
+                    rem = part_left_behind - (minimum_panel - reveal_edge_width)
+                    # position the new left edge
+                    left_edge -= rem
+                    reveal_indexes.append(left_edge)
+                break
+        else:
+            previous_edge = right_edge
+            right_edge += panelling_distance  # panelization is right to left, the right edge increases towards the left edge
+            # skipping the out range if there is a window
+            right_edge = skip_out_range(right_edge, out_range_index, False, previous_edge)
+
+            reveal_indexes.append(right_edge)
+
+            # reveal edge width subtracted from the right edge , to factor a 4' panel
+            rem_length = left_edge - (right_edge - reveal_edge_width)
+
+            if rem_length < maximum_panel:
+                if rem_length < minimum_panel:
+                    # remove the last record on list to allow for further splitting
+                    del reveal_indexes[-1]
+                    if len(reveal_indexes) != 0:
+                        right_edge = reveal_indexes[-1]  # the right edge becomes the last item on list
+                    part_left_behind = left_edge - right_edge
+                    rem = part_left_behind - (minimum_panel - reveal_edge_width)
+                    right_edge += rem
+                    reveal_indexes.append(right_edge)
+                break
+
+    return reveal_indexes
+
+
+def get_optimal_reveal_indexes(left_edge, right_edge, out_ranges, panel_spec, exterior=True):
+    """
+    Retrieve the reveal indexes with the fewest panels, then the fewest pieces below the minimum panel, then the
+    fewest panels short of a full panel. Solved as a shortest path over candidate reveal positions: the starting edge,
+    the out-range bounds and the minimum panel position from the far edge, each shifted by whole panelling distances.
+    The greedy layout is built from the same positions, so the panel count is never worse than the greedy one.
+    :param left_edge: The left edge of the part ( from exterior)
+    :param right_edge: The right edge of the part ( from exterior)
+    :param out_ranges: The ranges where the reveals should not be positioned closed to fenestration edges
+    :param panel_spec: PanelSpec
+    :param exterior: if exterior face, the panel position starts from left to right,
+     if not the panel position starts from right to left
+    :return: collection of indexes of the reveal position, None if there is no layout within the candidate bound
+    """
+    panelling_distance = panel_spec.panelling_distance
+    reveal_edge_width = panel_spec.reveal_edge_width
+    minimum_panel = panel_spec.minimum_panel
+    maximum_panel = panel_spec.maximum_panel
+
+    # offset reveal width from edge to allow cutting of first panel at 4'
+    right_edge = right_edge + panel_spec.right_offset
+    left_edge = left_edge - panel_spec.left_offset
+
+    # reveals are laid from the starting edge towards the end edge with decreasing positions,
+    # right to left panelization is mirrored onto negative positions
+    if exterior:
+        sign = 1
+        start, end = left_edge, right_edge
+    else:
+        sign = -1
+        start, end = -right_edge, -left_edge
+    starts, ends = merge_out_ranges([sorted([sign * a, sign * b]) for a, b in out_ranges])
+
+    # a reveal at position x leaves a last piece of x - floor
+    floor = end - reveal_edge_width
+    if start - floor < maximum_panel:
+        return None
+
+    # candidate positions: anchors shifted by whole panelling distances between the edges
+    anchors = [start, floor + minimum_panel] + starts + ends
+    candidates = set()
+    for anchor in anchors:
+        for direction in (-1, 1):
+            position = anchor
+            while floor < position <= start:
+                candidates.add(position)
+                if len(candidates) > maximum_candidates:
+                    return None
+                position += direction * panelling_distance
+
+    # drop positions strictly within an out-range
+    positions = [start]
+    for position in sorted(candidates, reverse=True):
+        i = bisect_right(starts, position) - 1
+        if position < start and not (i >= 0 and starts[i] < position < ends[i]):
+            positions.append(position)
+
+    # shortest path from the starting edge, cost: reveals, sub-minimum pieces, pieces short of a full panel
+    costs = [None] * len(positions)
+    previous = [None] * len(positions)
+    costs[0] = (0, 0, 0)
+    first = 0  # first position within a panelling distance of the current one
+    for j in range(1, len(positions)):
+        while positions[first] - positions[j] > panelling_distance:
+            first += 1
+        step_cost = None
+        for i in range(first, j):
+            if costs[i] is None:
+                continue
+            step = positions[i] - positions[j]
+            cost = (costs[i][0] + 1,
+                    costs[i][1] + (step + reveal_edge_width < minimum_panel),
+                    costs[i][2] + (step < panelling_distance))
+            if step_cost is None or cost < step_cost:
+                step_cost = cost
+                previous[j] = i
+        costs[j] = step_cost
+
+    # the layout ends on the reveal leaving less than a 4' piece
+    best = None
+    for j in range(1, len(positions)):
+        rem_length = positions[j] - floor
+        if costs[j] is None or rem_length >= maximum_panel:
+            continue
+        cost = (costs[j][0], costs[j][1] + (rem_length < minimum_panel), costs[j][2])
+        if best is None or cost < best[0]:
+            best = (cost, j)
+
+    if best is None:
+        return None
+
+    reveal_indexes = []
+    j = best[1]
+    while j != 0:
+        reveal_indexes.append(sign * positions[j])
+        j = previous[j]
+    reveal_indexes.reverse()
+
+    return reveal_indexes
+
+
+def get_panel_lengths(reveal_indexes, left_edge, right_edge, panel_spec, exterior=True):
+    """
+    Determine the approximate length of the panels cut by the reveal indexes, in the order they are placed
+    :param reveal_indexes: collection of indexes of the reveal position
+    :param left_edge: The left edge of the part ( from exterior)
+    :param right_edge: The right edge of the part ( from exterior)
+    :param panel_spec: PanelSpec
+    :param exterior: if the reveals were placed from left to right
+    :return: list of panel lengths
+    """
+    reveal_edge_width = panel_spec.reveal_edge_width
+    right_edge = right_edge + panel_spec.right_offset
+    left_edge = left_edge - panel_spec.left_offset
+
+    if exterior:
+        positions = [left_edge] + list(reveal_indexes)
+        last_panel = positions[-1] - (right_edge - reveal_edge_width)
+    else:
+        positions = [right_edge] + list(reveal_indexes)
+        last_panel = left_edge - (positions[-1] - reveal_edge_width)
+
+    panel_lengths = [abs(a - b) + reveal_edge_width for a, b in zip(positions, positions[1:])]
+    panel_lengths.append(last_panel)
+
+    return panel_lengths
+
+
+def get_single_panel_reveal_indexes(left_edge, right_edge, panel_spec, exterior=True):
+    """
+    Determine the position of a reveal index for a single panel
+    :param left_edge: left edge reveal index
+    :param right_edge: right edge reveal index
+    :param panel_spec: PanelSpec
+    :param exterior: if part exterior or not
+    :return: reveal index position to form a panel
+    """
+    panelling_distance = panel_spec.panelling_distance
+
+    if exterior:
+        return [left_edge - panelling_distance]
+
+    return [right_edge + panelling_distance]
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> EXISTING REVEALS
+
+def get_new_reveal_indexes(reveal_indexes, existing_indexes, tolerance=length_tolerance):
+    """
+    Filter planned reveals to those without an existing reveal within a tolerance
+    :param reveal_indexes: planned reveal indexes (units)
+    :param existing_indexes: sorted indexes of the reveals existing on the wall side (units)
+    :param tolerance: distance within which an existing reveal is the planned reveal (units)
+    :return: collection of reveal indexes to be created (units)
+    """
+    if len(existing_indexes) == 0:
+        return list(reveal_indexes)
+
+    new_reveal_indexes = []
+    for reveal_index in reveal_indexes:
+        i = bisect_left(existing_indexes, reveal_index - tolerance)
+        if i < len(existing_indexes) and existing_indexes[i] <= reveal_index + tolerance:
+            continue
+        new_reveal_indexes.append(reveal_index)
+
+    return new_reveal_indexes
+
+
+def get_span_reveal_indexes(existing_indexes, left_edge, right_edge, tolerance=length_tolerance):
+    """
+    Slice existing reveals to those within the edges of a part, reveals at the edges bound the part and are excluded
+    :param existing_indexes: sorted indexes of the reveals existing on the wall side (units)
+    :param left_edge: The left edge of the part (units)
+    :param right_edge: The right edge of the part (units)
+    :param tolerance: distance within the edges at which a reveal is at the edge (units)
+    :return: start, end positions of the slice
+    """
+    # the edges are ordered along the path curve, the smallest first, whichever end of the wall the part is read from
+    start_edge, end_edge = min(left_edge, right_edge), max(left_edge, right_edge)
+    return bisect_right(existing_indexes, start_edge + tolerance), bisect_left(existing_indexes, end_edge - tolerance)
+
+
+def get_face_edges(part_edges, face_part_edges, gap):
+    """
+    Merge a part with the parts of its face it is split from by reveals, the face is planned as a whole
+    :param part_edges: left edge, right edge of the part (units)
+    :param face_part_edges: collection of left edge, right edge of the parts of the same wall layer (units)
+    :param gap: widest distance between two parts split by a reveal (units)
+    :return: left edge, right edge of the face (units)
+    """
+    merged = []
+    for left_edge, right_edge in sorted(list(face_part_edges) + [part_edges], key=lambda x: x[1]):
+        if len(merged) != 0 and right_edge - merged[-1][0] <= gap:
+            merged[-1][0] = max(merged[-1][0], left_edge)
+        else:
+            merged.append([left_edge, right_edge])
+
+    centre_index = (part_edges[0] + part_edges[1]) // 2
+    for left_edge, right_edge in merged:
+        if right_edge <= centre_index <= left_edge:
+            return left_edge, right_edge
+
+    return tuple(part_edges)
+
+
+def match_reveal_indexes(reveal_indexes, existing_indexes):
+    """
+    Match existing reveals to planned reveals in order, matching as many as possible with the least total movement.
+    Matched reveals are moved, unmatched existing reveals are deleted and unmatched planned reveals created.
+    :param reveal_indexes: planned reveal indexes (units)
+    :param existing_indexes: sorted indexes of the existing reveals (units)
+    :return: collection of existing position, planned reveal index matched. existing positions unmatched,
+     planned reveal indexes unmatched
+    """
+    planned = sorted(reveal_indexes)
+    n = len(existing_indexes)
+    m = len(planned)
+
+    # costs[i][j]: (unmatched reveals, total movement) matching the first i existing to the first j planned
+    costs = [[(i + j, 0) for j in range(m + 1)] for i in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            unmatched, movement = costs[i - 1][j - 1]
+            cost = min((unmatched, movement + abs(existing_indexes[i - 1] - planned[j - 1])),
+                       (costs[i - 1][j][0] + 1, costs[i - 1][j][1]),
+                       (costs[i][j - 1][0] + 1, costs[i][j - 1][1]))
+            costs[i][j] = cost
+
+    matches = []
+    unmatched_existing = []
+    unmatched_planned = []
+    i, j = n, m
+    while i > 0 and j > 0:
+        unmatched, movement = costs[i - 1][j - 1]
+        if costs[i][j] == (unmatched, movement + abs(existing_indexes[i - 1] - planned[j - 1])):
+            matches.append((i - 1, planned[j - 1]))
+            i, j = i - 1, j - 1
+        elif costs[i][j] == (costs[i - 1][j][0] + 1, costs[i - 1][j][1]):
+            unmatched_existing.append(i - 1)
+            i -= 1
+        else:
+            unmatched_planned.append(planned[j - 1])
+            j -= 1
+    unmatched_existing.extend(range(i - 1, -1, -1))
+    unmatched_planned.extend(planned[j - 1::-1] if j > 0 else [])
+
+    matches.reverse()
+    unmatched_existing.reverse()
+    unmatched_planned.reverse()
+
+    return matches, unmatched_existing, unmatched_planned
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PLAN CACHE
+
+class PlanCache(object):
+    """
+    Least recently used cache of reveal plans, keyed on the normalized part geometry
+    """
+
+    def __init__(self, maximum_size=4096):
+        """
+        :param maximum_size: number of plans kept before the least recently used is discarded
+        """
+        self.maximum_size = maximum_size
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        :param key: normalized part geometry
+        :return: the cached plan, None if not cached
+        """
+        plan = self.plans.pop(key, None)
+        if plan is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.plans[key] = plan  # re-inserted as the most recently used
+        return plan
+
+    def put(self, key, plan):
+        """
+        :param key: normalized part geometry
+        :param plan: reveal offsets from the part centre
+        :return: None
+        """
+        self.plans.pop(key, None)
+        self.plans[key] = plan
+        if len(self.plans) > self.maximum_size:
+            self.plans.popitem(last=False)
+
+    def clear(self):
+        """
+        Discard all plans and reset the counters
+        :return: None
+        """
+        self.plans.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+plan_cache = PlanCache()
+
+
+def get_plan_cache_info():
+    """
+    Counters of the plan cache
+    :return: hits, misses, number of cached plans
+    """
+    return plan_cache.hits, plan_cache.misses, len(plan_cache.plans)
+
+
+def clear_plan_cache():
+    """
+    Discard all cached plans
+    :return: None
+    """
+    plan_cache.clear()
+
+
+def get_plan_key(part_length, part_centre_index, out_ranges, panel_spec, exterior, multiple, optimal):
+    """
+    Normalize the part geometry relative to its centre, identical parts anywhere along any wall share a key
+    :param part_length: Length of part
+    :param part_centre_index: Index of part centre
+    :param out_ranges: merged out-ranges relevant to the part
+    :param panel_spec: PanelSpec
+    :param exterior: direction of panelization
+    :param multiple: Bool single panel or multi-panel reveal distances
+    :param optimal: Bool optimal layout
+    :return: hashable key
+    """
+    relative_out_ranges = tuple((start - part_centre_index, end - part_centre_index)
+                                for start, end in zip(*out_ranges))
+    return abs(part_length), relative_out_ranges, bool(exterior), bool(multiple), bool(optimal), panel_spec
+
+
+def plan_reveal_indexes(part_length, part_centre_index, out_ranges, panel_spec, exterior=True, multiple=True,
+                        optimal=False):
+    """
+    Plan the reveal positions of a part from plain data. Multi-panel plans are cached, a part repeating the length,
+    openings and direction of an earlier part reuses its reveal offsets from the part centre.
+    :param part_length: Length of part
+    :param part_centre_index: Index of part centre
+    :param out_ranges: The ranges where the reveals should not be positioned
+    :param panel_spec: PanelSpec
+    :param exterior: direction of panelization, left to right (True) or right to left (False)
+    :param multiple: Bool to determine single panel or multi-panel reveal distances
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces
+    :return: collection of indexes of the reveal position
+    """
+    left_edge, right_edge = get_part_edge_index(part_length, part_centre_index)
+
+    if not multiple:
+        # a single reveal at the centre, nothing to reuse
+        return get_single_panel_reveal_indexes(left_edge, right_edge, panel_spec, exterior)
+
+    # only out-ranges within a panel of the part can move its reveals
+    panelling_distance = panel_spec.panelling_distance
+    starts, ends = merge_out_ranges(out_ranges)
+    relevant = [(start, end) for start, end in zip(starts, ends)
+                if end >= right_edge - panelling_distance and start <= left_edge + panelling_distance]
+    out_range_index = ([start for start, end in relevant], [end for start, end in relevant])
+
+    key = get_plan_key(part_length, part_centre_index, out_range_index, panel_spec, exterior, multiple, optimal)
+    offsets = plan_cache.get(key)
+
+    if offsets is None:
+        reveal_indexes = get_reveal_indexes(left_edge, right_edge, relevant, panel_spec, exterior, optimal)
+        offsets = tuple(reveal_index - part_centre_index for reveal_index in reveal_indexes)
+        plan_cache.put(key, offsets)
+
+    return [part_centre_index + offset for offset in offsets]
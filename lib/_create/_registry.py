@@ -0,0 +1,166 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Per-document registry of the lap types, BamCore wall types and solid fill pattern,
+resolved by name or type mark once, instead of element ids of a single template.
+Wall types and the rules of their layers are declared in wall_type_rules.json.
+Lap types are resolved on their first use, the takeoff and highlight tools do not depend on them.
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.DB import Element, ElementId, FilteredElementCollector
+
+import clr
+
+clr.AddReference("System")
+
+from collections import namedtuple
+
+from _create import _parts as p
+from _create import _rules as ru
+from _create import _errorhandler as eh
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
+
+app = __revit__.Application  # represents the Revit Autodesk Application
+doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
+uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
+
+# names or type marks of the types, matched regardless of case
+left_lap_names = ("Left Lap", "BamCore Left Lap")
+right_lap_names = ("Right Lap", "BamCore Right Lap")
+
+# ids of the template provided, used when no type of the names is found and the id exists in the document
+template_left_lap_ids = (352818,)
+template_right_lap_ids = (352808,)
+template_solid_fill_ids = (20,)
+
+# names and template ids of the lap types of the wall type rules
+lap_types = {
+    "left": (left_lap_names, template_left_lap_ids),
+    "right": (right_lap_names, template_right_lap_ids),
+}
+
+registries = {}  # registry per document
+lap_type_ids = {}  # lap type id (int) per document and lap
+
+
+class Registry(namedtuple("Registry", ["wall_type_rules", "solid_fill_id"])):
+    """
+    Registry of a document, element ids as integers,
+    wall type rules compiled into a lookup keyed by (wall type id, layer index)
+    """
+    __slots__ = ()
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> RESOLVE FUNCTIONS
+
+def find_type_ids(element_types, names, template_ids):
+    """
+    Find the ids of types by name or type mark, falling back to the template ids among the types
+    :param element_types: collection of element types of a single category or class
+    :param names: collection of names or type marks
+    :param template_ids: collection of template ids (int)
+    :return: set of type ids (int)
+    """
+    names = set(name.lower() for name in names)
+    type_ids = set()
+    for element_type in element_types:
+        name = Element.Name.GetValue(element_type) or ""
+        type_mark = element_type.get_Parameter(BuiltInParameter.ALL_MODEL_TYPE_MARK)
+        type_mark = type_mark.AsString() if type_mark is not None else None
+        if name.lower() in names or (type_mark is not None and type_mark.lower() in names):
+            type_ids.add(p.get_element_id_value(element_type.Id))
+
+    if len(type_ids) == 0:
+        # a template id is only accepted for a type of the category or class collected,
+        # in a document not made from the template the same id can be any other element
+        element_type_ids = set(p.get_element_id_value(x.Id) for x in element_types)
+        type_ids = set(x for x in template_ids if x in element_type_ids)
+
+    return frozenset(type_ids)
+
+
+def find_lap_type_id(names, template_ids, document=doc):
+    """
+    Find the id of a lap (reveal) type by name or type mark
+    :param names: collection of names or type marks
+    :param template_ids: collection of template ids (int)
+    :param document: Revit document
+    :return: lap type id (int)
+    """
+    reveal_types = FilteredElementCollector(document).OfCategory(BuiltInCategory.OST_Reveals). \
+        WhereElementIsElementType().ToElements()
+    lap_type_ids = find_type_ids(reveal_types, names, template_ids)
+    if len(lap_type_ids) == 0:
+        raise eh.LapTypeNotFoundError("No reveal type named or marked {}".format(" or ".join(names)))
+
+    return min(lap_type_ids)
+
+
+def find_solid_fill_id(document=doc):
+    """
+    Find the id of the solid fill pattern
+    :param document: Revit document
+    :return: solid fill pattern id (int)
+    """
+    for fill_pattern_element in FilteredElementCollector(document).OfClass(FillPatternElement):
+        if fill_pattern_element.GetFillPattern().IsSolidFill:
+            return p.get_element_id_value(fill_pattern_element.Id)
+
+    return template_solid_fill_ids[0]
+
+
+def resolve_registry(document=doc):
+    """
+    Resolve the registry of a document
+    :param document: Revit document
+    :return: Registry
+    """
+    wall_types = FilteredElementCollector(document).OfClass(WallType).ToElements()
+    config = ru.load_wall_type_rules()
+    wall_type_ids = [find_type_ids(wall_types, x["type_names"], x["template_ids"])
+                     for x in config["wall_types"]]
+
+    return Registry(ru.compile_wall_type_rules(config, wall_type_ids), find_solid_fill_id(document))
+
+
+def get_registry(document=doc):
+    """
+    Retrieve the registry of a document, resolved on the first request
+    :param document: Revit document
+    :return: Registry
+    """
+    key = document.PathName or document.Title
+    registry = registries.get(key)
+    if registry is None:
+        registry = resolve_registry(document)
+        registries[key] = registry
+
+    return registry
+
+
+def get_lap_type_id(lap, document=doc):
+    """
+    Retrieve the id of a lap type of a document, resolved on the first request
+    :param lap: lap of the wall type rules, left or right
+    :param document: Revit document
+    :return: lap type id (int)
+    """
+    key = (document.PathName or document.Title, lap)
+    lap_type_id = lap_type_ids.get(key)
+    if lap_type_id is None:
+        names, template_ids = lap_types[lap]
+        lap_type_id = find_lap_type_id(names, template_ids, document)
+        lap_type_ids[key] = lap_type_id
+
+    return lap_type_id
+
+
+def clear_registries():
+    """Clear the registries and lap types, resolved again on the next request"""
+    registries.clear()
+    lap_type_ids.clear()
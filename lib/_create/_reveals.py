@@ -0,0 +1,117 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.DB import Element, ElementId, FilteredElementCollector
+from Autodesk.Revit.UI.Selection import ObjectType
+from Autodesk.Revit.UI.Selection import ISelectionFilter
+
+import clr
+
+clr.AddReference("System")
+
+from _create import _planner as pl
+from _create import _faceindex as fi
+from _create import _errorhandler as eh
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
+
+app = __revit__.Application  # represents the Revit Autodesk Application
+doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
+uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> REVEAL INDEX
+
+def read_existing_reveals(wall_id, side_of_wall):
+    """
+    Read the reveals on a side of a wall from the model, including the changes made earlier in the run
+    :param wall_id: host wall id
+    :param side_of_wall: side of the wall
+    :return: sorted reveal distances (units), matching reveal ids
+    """
+    wall = doc.GetElement(wall_id)
+    reveal_filter = ElementCategoryFilter(BuiltInCategory.OST_Reveals)
+
+    distances = []
+    for reveal_id in wall.GetDependentElements(reveal_filter):
+        reveal = doc.GetElement(reveal_id)
+        if not isinstance(reveal, WallSweep):
+            continue
+        wall_sweep_info = reveal.GetWallSweepInfo()
+        if not wall_sweep_info.IsVertical or wall_sweep_info.WallSide != side_of_wall:
+            continue
+        distances.append((pl.to_units(wall_sweep_info.Distance), reveal.Id))
+
+    distances.sort(key=lambda x: x[0])
+    return [x[0] for x in distances], [x[1] for x in distances]
+
+
+def get_new_reveal_indexes(wall_id, side_of_wall, reveal_indexes):
+    """
+    Filter planned reveals to those without an existing reveal at the same distance on the wall side.
+    The reveals are read from the model, the session face index may miss changes made outside the session.
+    :param wall_id: host wall id
+    :param side_of_wall: side of the wall
+    :param reveal_indexes: planned reveal indexes (units)
+    :return: collection of reveal indexes to be created (units)
+    """
+    existing_indexes, existing_ids = read_existing_reveals(wall_id, side_of_wall)
+    return pl.get_new_reveal_indexes(reveal_indexes, existing_indexes)
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> SELECT FUNCTIONS
+
+class RevealSelectionFilter(ISelectionFilter):
+    """
+    a class to filter selections to reveals only
+    """
+
+    def AllowElement(self, element):
+        if element.Category is not None and element.Category.Name == "Reveals":
+            return True
+        return False
+
+    def AllowReference(self, refer, point):
+        return False
+
+
+def select_reveal():
+    """
+    Selects a reveal
+    :return:A reveal
+    """
+    reference = uidoc.Selection.PickObject(ObjectType.Element, RevealSelectionFilter())
+    reveal = uidoc.Document.GetElement(reference)
+    if isinstance(reveal, WallSweep):
+        return reveal
+    else:
+        raise eh.RevealNotSelectedError
+
+
+def select_reveals():
+    """
+    Selects multiple reveals
+    :return: collection of reveals
+    """
+    references = uidoc.Selection.PickObjects(ObjectType.Element, RevealSelectionFilter())
+    reveals = [uidoc.Document.GetElement(reference) for reference in references]
+    reveals = [reveal for reveal in reveals if isinstance(reveal, WallSweep)]
+    if len(reveals) == 0:
+        raise eh.RevealNotSelectedError
+
+    return reveals
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> FACE REVEALS
+
+def get_face_reveal_ids(reveals):
+    """
+    Retrieve the ids of all reveals on the faces of the reveals provided
+    :param reveals: collection of reveals
+    :return: collection of reveal Element Ids
+    """
+    faces = [face for face in (fi.get_face(reveal) for reveal in reveals) if face is not None]
+    return [ElementId(x) for x in fi.get_face_reveal_ids(doc, faces)]
@@ -0,0 +1,115 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Wall type rules: the side, lap and direction of the parts of each layer of a wall type, declared in
+wall_type_rules.json and compiled into a flat lookup keyed by (wall type id, layer index). Revit-free.
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+import io
+import json
+import os
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
+
+rules_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wall_type_rules.json")
+rules_file_version = 1
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> LOAD FUNCTIONS
+
+def get_rule(rule):
+    """
+    Validate a rule of a layer
+    :param rule: dict of side (Exterior/Interior), lap (left/right) and exterior (true, false or null for the core)
+    :return: lap, side, exterior
+    """
+    if rule.get("side") not in ("Exterior", "Interior") or rule.get("lap") not in ("left", "right") or \
+            rule.get("exterior") not in (True, False, None):
+        raise ValueError("Invalid wall type rule: {}".format(rule))
+
+    return rule["lap"], rule["side"], rule["exterior"]
+
+
+def load_wall_type_rules(file_path=rules_file):
+    """
+    Load the wall type rules
+    :param file_path: rules file path
+    :return: wall type rules
+    """
+    with io.open(file_path, "r", encoding="utf-8") as rules:
+        config = json.loads(rules.read())
+
+    if config.get("version") != rules_file_version:
+        raise ValueError("Unsupported wall type rules version: {}".format(config.get("version")))
+
+    return config
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> COMPILE FUNCTIONS
+
+def compile_layer_rules(wall_type_id, wall_type_rules, compiled):
+    """
+    Compile the layer rules of a wall type into the lookup
+    :param wall_type_id: wall type id (int), None for the default rules
+    :param wall_type_rules: rules of the wall type
+    :param compiled: lookup keyed by wall type id, layer index (None for other layers)
+    :return: None
+    """
+    for layer_index, rule in wall_type_rules.get("layers", {}).items():
+        compiled[(wall_type_id, int(layer_index))] = get_rule(rule)
+    compiled[(wall_type_id, None)] = get_rule(wall_type_rules["other_layers"])
+
+
+def compile_wall_type_rules(config, wall_type_ids):
+    """
+    Compile the wall type rules into a flat lookup
+    :param config: wall type rules
+    :param wall_type_ids: collection of the ids (int) of each wall type of the rules, in order
+    :return: lookup keyed by wall type id, layer index
+    """
+    compiled = {}
+    compile_layer_rules(None, config["default"], compiled)
+    for wall_type_rules, type_ids in zip(config["wall_types"], wall_type_ids):
+        for wall_type_id in type_ids:
+            compile_layer_rules(wall_type_id, wall_type_rules, compiled)
+
+    return compiled
+
+
+def get_wall_type_rule(compiled, wall_type_id, layer_index):
+    """
+    Look up the rule of a layer of a wall type, falling back to the other layers of the wall type
+    then the default rules. Fallbacks are added to the lookup, repeated lookups are a single hash lookup.
+    :param compiled: lookup keyed by wall type id, layer index
+    :param wall_type_id: wall type id (int)
+    :param layer_index: layer index
+    :return: lap, side, exterior
+    """
+    key = (wall_type_id, layer_index)
+    rule = compiled.get(key)
+    if rule is None:
+        rule = compiled.get((wall_type_id, None)) or compiled.get((None, layer_index)) or compiled[(None, None)]
+        compiled[key] = rule
+
+    return rule
+
+
+def get_layer_indexes(compiled, exteriors=(True, False)):
+    """
+    Collect the layer indexes of the parts of the given directions, to select the parts by layer index in Revit
+    :param compiled: lookup keyed by wall type id, layer index
+    :param exteriors: directions of the parts, True exterior, False interior, None the core
+    :return: sorted layer indexes, None if the other layers of a wall type match, thus any layer index
+    """
+    layer_indexes = set()
+    for (wall_type_id, layer_index), (lap, side, exterior) in compiled.items():
+        if exterior not in exteriors:
+            continue
+        if layer_index is None:
+            return None
+        layer_indexes.add(layer_index)
+
+    return sorted(layer_indexes)
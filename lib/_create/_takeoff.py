@@ -0,0 +1,98 @@
+from __future__ import division
+# -*- coding: utf-8 -*-
+
+"""
+Panel material takeoff: parts grouped by height and length in a single pass,
+accumulating count, area, volume and cost together, then merged by the labels displayed. Revit-free.
+"""
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> IMPORTS
+
+from _create import _planner as pl
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> AGGREGATION
+
+def group_parts(parts_data):
+    """
+    Group parts of the same height and length, in a single pass
+    :param parts_data: collection of height, length (units), thickness, volume, base level, area of each part
+    :return: collection of groups in order of first part, each group: index of first part, count, total area,
+     total volume
+    """
+    groups = {}
+    ordered_groups = []
+    for i, part_data in enumerate(parts_data):
+        key = (part_data[0], part_data[1])
+        group = groups.get(key)
+        if group is None:
+            group = [i, 0, 0.0, 0.0]
+            groups[key] = group
+            ordered_groups.append(group)
+        group[1] += 1
+        group[2] += part_data[5]
+        group[3] += part_data[3]
+
+    return ordered_groups
+
+
+def merge_groups(groups, get_labels):
+    """
+    Merge groups displayed with the same labels, lengths within a rounding of each other are a single panel type
+    :param groups: collection of groups in order of first part, as group_parts
+    :param get_labels: function of the index of a part returning its height, length labels, called once per group
+    :return: collection of labels, merged group in order of first part
+    """
+    merged = {}
+    ordered_groups = []
+    for first, count, total_area, total_volume in groups:
+        labels = get_labels(first)
+        group = merged.get(labels)
+        if group is None:
+            group = [first, 0, 0.0, 0.0]
+            merged[labels] = group
+            ordered_groups.append((labels, group))
+        group[1] += count
+        group[2] += total_area
+        group[3] += total_volume
+
+    return ordered_groups
+
+
+def get_summary_data(parts_data, cost_per_sf, get_labels=None):
+    """
+    Sum up parts data into panel types and a total of panels, volume, area and cost
+    :param parts_data: collection of height, length (units), thickness, volume, base level, area of each part
+    :param cost_per_sf: cost per square feet
+    :param get_labels: function of the index of a part returning its height, length labels, called once per height
+     and length. Parts of the same labels are a single panel type. Lengths in feet if None
+    :return: rows of height, length, thickness, volume, base level, area, count, total area, cost per sf, total cost.
+     Last row totals
+    """
+    final_data = []
+    sum_panels = 0
+    sum_area = 0
+    sum_volume = 0
+    sum_cost = 0
+
+    if get_labels is None:
+        def get_labels(i):
+            return pl.to_feet(parts_data[i][0]), pl.to_feet(parts_data[i][1])
+
+    for (height_label, length_label), (first, count, total_area, total_volume) in \
+            merge_groups(group_parts(parts_data), get_labels):
+        height, length, thickness, volume, base_level, area = parts_data[first]
+
+        total_cost = total_area * cost_per_sf
+        final_data.append([height_label, length_label, thickness, volume, base_level, area, count, total_area,
+                           cost_per_sf, total_cost])
+
+        sum_panels += count
+        sum_area += total_area
+        sum_volume += total_volume
+        sum_cost += total_cost
+
+    sum_total = ["-", "-", "-", sum_volume, "-", "-", sum_panels, sum_area, "-", sum_cost]
+    final_data.append(sum_total)
+
+    return final_data
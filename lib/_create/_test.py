@@ -19,6 +19,7 @@ from _create import _coordinate as c
 from _create import _openings as o
 from _create import _errorhandler as e
 from _create import _checks as cc
+from _create import _planner as pl
 from pyrevit import forms
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
@@ -69,18 +70,20 @@ def test_fenestration_edges(__title__, window_option=True):
             window_centre_index = o.get_fenestration_centre_index(part, window, reveal_coordinate_0)
             fenestration_width = o.get_fenestration_width(window.Id)
             print (fenestration_width)
-            edges_1, edges_2 = o.get_fenestration_edge_indexes(fenestration_width, window_centre_index)
-            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, edges_1, side_of_wall)
-            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, edges_2, side_of_wall)
+            edges_1, edges_2 = o.get_fenestration_edge_indexes(pl.to_units(fenestration_width),
+                                                               pl.to_units(window_centre_index))
+            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(edges_1), side_of_wall)
+            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(edges_2), side_of_wall)
 
     else:
         for door in hosted_doors:
             door_centre_index = o.get_fenestration_centre_index(part, door, reveal_coordinate_0)
             fenestration_width = o.get_fenestration_width(door.Id)
             print (fenestration_width)
-            edges_1, edges_2 = o.get_fenestration_edge_indexes(fenestration_width, door_centre_index)
-            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, edges_1, side_of_wall)
-            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, edges_2, side_of_wall)
+            edges_1, edges_2 = o.get_fenestration_edge_indexes(pl.to_units(fenestration_width),
+                                                               pl.to_units(door_centre_index))
+            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(edges_1), side_of_wall)
+            a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(edges_2), side_of_wall)
 
 
 def test_out_ranges(__title__, displacement_distance, window_option=True):
@@ -99,12 +102,13 @@ def test_out_ranges(__title__, displacement_distance, window_option=True):
             window_centre_index = o.get_fenestration_centre_index(part, window, reveal_coordinate_0)
             fenestration_width = o.get_fenestration_width(window.Id)
 
-            edges_1, edges_2 = o.get_fenestration_edge_indexes(fenestration_width, window_centre_index)
-            out_ranges = o.get_fenestration_out_range(edges_1, edges_2, displacement_distance)
+            edges_1, edges_2 = o.get_fenestration_edge_indexes(pl.to_units(fenestration_width),
+                                                               pl.to_units(window_centre_index))
+            out_ranges = o.get_fenestration_out_range(edges_1, edges_2, pl.to_units(displacement_distance))
 
             for fen_range in out_ranges:
-                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, fen_range[0], side_of_wall)
-                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, fen_range[1], side_of_wall)
+                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(fen_range[0]), side_of_wall)
+                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(fen_range[1]), side_of_wall)
 
 
     else:
@@ -112,12 +116,13 @@ def test_out_ranges(__title__, displacement_distance, window_option=True):
             window_centre_index = o.get_fenestration_centre_index(part, door, reveal_coordinate_0)
             fenestration_width = o.get_fenestration_width(door.Id)
 
-            edges_1, edges_2 = o.get_fenestration_edge_indexes(fenestration_width, window_centre_index)
-            out_ranges = o.get_fenestration_out_range(edges_1, edges_2, displacement_distance)
+            edges_1, edges_2 = o.get_fenestration_edge_indexes(pl.to_units(fenestration_width),
+                                                               pl.to_units(window_centre_index))
+            out_ranges = o.get_fenestration_out_range(edges_1, edges_2, pl.to_units(displacement_distance))
 
             for fen_range in out_ranges:
-                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, fen_range[0], side_of_wall)
-                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, fen_range[1], side_of_wall)
+                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(fen_range[0]), side_of_wall)
+                a.auto_place_reveal(__title__, host_wall_id, lap_type_id, pl.to_feet(fen_range[1]), side_of_wall)
 
 
 def check_centre_index(__title__, part, centre_index):
@@ -125,7 +130,7 @@ def check_centre_index(__title__, part, centre_index):
     host_wall_id = p.get_host_wall_id(part)
     layer_index = p.get_layer_index(part)
     host_wall_type_id = p.get_host_wall_type_id(host_wall_id)
-    lap_type_id, side_of_wall, exterior = p.get_wallsweep_parameters(layer_index, host_wall_type_id)
+    lap_type_id, side_of_wall, exterior = p.get_wall_sweep_parameters(layer_index, host_wall_type_id)
 
     length_before = p.get_part_length(part)
 
@@ -135,10 +140,10 @@ def check_centre_index(__title__, part, centre_index):
     length_after = p.get_part_length(part)
 
     # delete reveal after split
-    p.delete_element(__title__, reveal.Id)
+    a.delete_element(__title__, reveal.Id)
 
     half_length = length_before / 2
-    reveal_size = 0.0390625  # 3/64"
+    reveal_size = pl.to_feet(p.get_panel_spec().reveal_width) / 2  # half the reveal cut
     length_parameter = round(half_length, 7) + reveal_size
     if round(length_after, 7) == length_parameter:
         centre_index = True
@@ -10,12 +10,17 @@ from Autodesk.Revit.UI.Selection import ObjectType
 import clr
 
 clr.AddReference("System")
+from System.Collections.Generic import List
 from _create import _parts as p
 from _create import _test as tt
 from _create import _openings as o
 from _create import _coordinate as c
 from _create import _errorhandler as eh
 from _create import _forms as ff
+from _create import _planner as pl
+from _create import _journal as j
+from _create import _reveals as rv
+from _create import _registry as r
 
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> VARIABLES
@@ -27,6 +32,9 @@ rvt_year = int(app.VersionNumber)
 active_view = doc.ActiveView
 active_level = doc.ActiveView.GenLevel
 
+overrides_file_id = "panelization_overrides"  # part ids overridden per view by highlights
+highlight_filter_names = ("Panelization - Unpanelized", "Panelization - Underpanelized")
+
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PLACE REVEAL TRANSACTION
 
@@ -62,12 +70,35 @@ def auto_place_reveal(__title__, host_wall_id, lap_type_id, variable_distance, s
     return reveal
 
 
-def get_reveal_coordinate_at_0(__title__, part):
+def get_reveal_coordinate_at_0(__title__, part, probe=False):
     """
-    Get the coordinates of the reveal at distance 0
+    Get the coordinates of the reveal at distance 0, derived from the host wall's path curve with no model writes
     :param __title__: Tool title
     :param part: Part to be panelized
+    :param probe: Bool to fall back to placing probe reveals to establish the coordinates
+    :return: reveal plane coordinate at 0
+    """
+    if probe:
+        return probe_reveal_coordinate_at_0(__title__, part)
+
+    host_wall_id = p.get_host_wall_id(part)
+    host_wall_type_id = p.get_host_wall_type_id(host_wall_id)
+    layer_index = p.get_layer_index(part)
+    lap_type_id, side_of_wall, exterior = p.get_wall_sweep_parameters(layer_index, host_wall_type_id)
 
+    # a reveal already on the side of the wall anchors the datum, read without writing to the model
+    existing_indexes, existing_ids = rv.read_existing_reveals(host_wall_id, side_of_wall)
+    reveal = doc.GetElement(existing_ids[0]) if len(existing_ids) != 0 else None
+
+    return c.get_wall_frame(host_wall_id).get_datum(side_of_wall, reveal)
+
+
+def probe_reveal_coordinate_at_0(__title__, part):
+    """
+    Get the coordinates of the reveal at distance 0 by placing and deleting two probe reveals
+    :param __title__: Tool title
+    :param part: Part to be panelized
+    :return: reveal plane coordinate at 0
     """
 
     # project parameters
@@ -124,15 +155,90 @@ def get_reveal_coordinate_at_0(__title__, part):
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PANELIZE TRANSACTIONS
 
 
+def place_reveals(host_wall_id, lap_type_id, reveal_indexes, side_of_wall, skip_existing=True):
+    """
+    Place reveals along the wall's path curve as per reveal indexes provided, within an open transaction
+    :param host_wall_id:host wall id
+    :param lap_type_id:Element id of the wall sweep type used
+    :param reveal_indexes: list of reveal distance indexes along the wall's path curve (units)
+    :param side_of_wall: side of the wall to which the reveal is attached.
+    :param skip_existing: Bool to skip reveals already placed on the wall side, re-running is idempotent
+    :return: collection of wall sweeps created
+    """
+    if skip_existing:
+        reveal_indexes = rv.get_new_reveal_indexes(host_wall_id, side_of_wall, reveal_indexes)
+
+    wall_sweeps = []
+    for reveal_index in reveal_indexes:
+        # reveal indexes are converted to feet only when the reveal is created
+        wall_sweep = p.create_reveal(host_wall_id, lap_type_id, pl.to_feet(reveal_index), side_of_wall)
+        wall_sweeps.append(wall_sweep)
+
+    return wall_sweeps
+
+
+def rebalance_reveals(host_wall_id, lap_type_id, reveal_indexes, side_of_wall, face_edges):
+    """
+    Match the reveals existing within a face to the planned reveals of the face, within an open transaction.
+    The reveals are read from the model, reflecting the faces rebalanced earlier in the run.
+    Matched reveals are moved in place, keeping their element ids, only the difference is created or deleted.
+    :param host_wall_id:host wall id
+    :param lap_type_id:Element id of the wall sweep type used
+    :param reveal_indexes: list of reveal distance indexes along the wall's path curve (units)
+    :param side_of_wall: side of the wall to which the reveal is attached.
+    :param face_edges: left edge, right edge of the face, the parts split from each other by reveals (units)
+    :return: collection of wall sweeps created, collection of reveal id (int), distance (feet), wall sweep type id
+     (int) of the reveals moved before the run, collection of distance (feet), wall sweep type id (int) of the
+     reveals deleted
+    """
+    existing_indexes, existing_ids = rv.read_existing_reveals(host_wall_id, side_of_wall)
+    left_edge, right_edge = face_edges
+    start, end = pl.get_span_reveal_indexes(existing_indexes, left_edge, right_edge)
+    span_indexes = existing_indexes[start:end]
+    span_ids = existing_ids[start:end]
+
+    matches, unmatched_existing, unmatched_planned = pl.match_reveal_indexes(reveal_indexes, span_indexes)
+
+    moved = []
+    for i, reveal_index in matches:
+        reveal = doc.GetElement(span_ids[i])
+        wall_sweep_info = reveal.GetWallSweepInfo()
+        type_id = reveal.GetTypeId()
+        distance = wall_sweep_info.Distance
+
+        changed = False
+        if type_id != lap_type_id:
+            reveal.ChangeTypeId(lap_type_id)
+            changed = True
+        if abs(span_indexes[i] - reveal_index) > pl.length_tolerance:
+            wall_sweep_info.Distance = pl.to_feet(reveal_index)
+            reveal.ChangeWallSweepInfo(wall_sweep_info)
+            changed = True
+
+        if changed:
+            moved.append((p.get_element_id_value(reveal.Id), distance, p.get_element_id_value(type_id)))
+
+    deleted = []
+    if len(unmatched_existing) != 0:
+        for i in unmatched_existing:
+            reveal = doc.GetElement(span_ids[i])
+            deleted.append((reveal.GetWallSweepInfo().Distance, p.get_element_id_value(reveal.GetTypeId())))
+        doc.Delete(List[ElementId]([span_ids[i] for i in unmatched_existing]))
+
+    wall_sweeps = place_reveals(host_wall_id, lap_type_id, unmatched_planned, side_of_wall, skip_existing=False)
+
+    return wall_sweeps, moved, deleted
+
+
 def auto_panel(__title__, host_wall_id, lap_type_id, reveal_indexes, side_of_wall):
     """
     Auto place reveals along the wall's path curve as per reveal indexes provided
     :param __title__:Tool title
     :param lap_type_id:Element id of the wall sweep type used
     :param host_wall_id:host wall id
-    :param reveal_indexes: list of reveal distance indexes along the wall's path curve
+    :param reveal_indexes: list of reveal distance indexes along the wall's path curve (units)
     :param side_of_wall: side of the wall to which the reveal is attached.
-    :return: None
+    :return: collection of wall sweeps
     """
 
     with Transaction(doc, __title__) as t:
@@ -147,8 +253,7 @@ def auto_panel(__title__, host_wall_id, lap_type_id, reveal_indexes, side_of_wal
         options.SetFailuresPreprocessor(failureProcessor)
         t.SetFailureHandlingOptions(options)
 
-        for reveal_index in reveal_indexes:
-            wall_sweep = p.create_reveal(host_wall_id, lap_type_id, reveal_index, side_of_wall)
+        wall_sweeps = place_reveals(host_wall_id, lap_type_id, reveal_indexes, side_of_wall)
         status = t.Commit()
 
         if status != TransactionStatus.Committed:
@@ -156,22 +261,23 @@ def auto_panel(__title__, host_wall_id, lap_type_id, reveal_indexes, side_of_wal
             # the part could not be established correctly generating a wrong set of reveal indexes outside the panel
             raise eh.CentreIndexError
 
+    return wall_sweeps
 
-def auto_parts(__title__, part, displacement_distance, switch_option, multiple=True):
-    """
-    Auto Identifies :
-    1. The part wall side ( exterior, interior or partition ) intuitively
-    2. The lap (right or left) to be used to be used intuitively
-    3. Direction to be used  right-> left or left->right by user choice
-    and places reveals along the wall's path's curve thus creating panels
 
+def get_part_reveal_indexes(__title__, part, displacement_distance, switch_option, multiple=True, probe=False,
+                            optimal=False, face=False):
+    """
+    Establish the reveals of a part without modifying the model, except for probe reveals when probe is set
     :param multiple: Bool to determine single panel or multi-panel reveal distances
+    :param probe: Bool to establish the reveal at 0 with probe reveals instead of the wall's path curve
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces around openings
+    :param face: Bool to plan the whole face of the part, merged with the parts it is split from by reveals
     :param switch_option: Bool to switch direction of placing reveals: left to right/right to left
     :param displacement_distance: Distance away from the edges of openings
     :param part: Part to be panelized
     :param __title__: tool title
 
-    :return: None
+    :return: host wall id, lap type id, reveal indexes (units), side of wall, part edges (units)
     """
 
     host_wall_id = p.get_host_wall_id(part)
@@ -180,12 +286,16 @@ def auto_parts(__title__, part, displacement_distance, switch_option, multiple=T
     lap_type_id, side_of_wall, exterior = p.get_wall_sweep_parameters(layer_index, host_wall_type_id)
 
     # Test if the panel is divisible into two equal parts
-    reveal_plane_coordinate_0 = get_reveal_coordinate_at_0(__title__, part)
-    centre_index = p.get_part_centre_index(part, reveal_plane_coordinate_0)
+    reveal_plane_coordinate_0 = get_reveal_coordinate_at_0(__title__, part, probe=probe)
+    centre_index = pl.to_units(p.get_part_centre_index(part, reveal_plane_coordinate_0))
+
+    part_length = pl.to_units(p.get_part_length(part))
 
-    # create left and right edge
-    part_length = p.get_part_length(part)
-    left_edge, right_edge = p.get_part_edge_index(part_length, centre_index)
+    if face:
+        left_edge, right_edge = get_face_edges(part, host_wall_id, layer_index, reveal_plane_coordinate_0,
+                                               pl.get_part_edge_index(part_length, centre_index))
+        part_length = left_edge - right_edge
+        centre_index = right_edge + part_length // 2
 
     hosted_windows = o.get_hosted_fenestrations(host_wall_id, BuiltInCategory.OST_Windows)
     hosted_doors = o.get_hosted_fenestrations(host_wall_id, BuiltInCategory.OST_Doors)
@@ -194,20 +304,225 @@ def auto_parts(__title__, part, displacement_distance, switch_option, multiple=T
     if len(hosted_windows) == 0 and len(hosted_doors) == 0:
         out_ranges = []
     else:
-        displacement = displacement_distance
+        displacement = pl.to_units(displacement_distance)
         out_ranges = o.get_out_ranges(part, hosted_doors, hosted_windows, reveal_plane_coordinate_0, displacement)
 
     # interchanges the direction of placing reveals
     exterior = p.switch_directions(exterior, switch_direction=switch_option)
 
-    # determine single panel or multi-panel reveal distances
-    if multiple:
-        reveal_indexes = p.get_reveal_indexes(left_edge, right_edge, out_ranges, exterior)
-    else:
-        reveal_indexes = p.get_single_panel_reveal_indexes(left_edge, right_edge, exterior)
+    # determine single panel or multi-panel reveal distances, repeated part geometries reuse a cached plan
+    reveal_indexes = p.plan_reveal_indexes(part_length, centre_index, out_ranges, exterior, multiple, optimal)
+
+    return host_wall_id, lap_type_id, reveal_indexes, side_of_wall, pl.get_part_edge_index(part_length, centre_index)
+
+
+def get_face_edges(part, host_wall_id, layer_index, reveal_plane_coordinate_0, part_edges):
+    """
+    Establish the edges of the face of a part, the part merged with the parts of the same wall layer
+    it is split from by reveals
+    :param part: Part to be panelized
+    :param host_wall_id: host wall id
+    :param layer_index: layer index of the part
+    :param reveal_plane_coordinate_0: reveal plane coordinate at 0 of the host wall
+    :param part_edges: left edge, right edge of the part (units)
+    :return: left edge, right edge of the face (units)
+    """
+    face_part_edges = []
+    for part_id in PartUtils.GetAssociatedParts(doc, host_wall_id, False, True):
+        face_part = doc.GetElement(part_id)
+        if part_id == part.Id or p.get_layer_index(face_part) != layer_index:
+            continue
+        centre_index = pl.to_units(p.get_part_centre_index(face_part, reveal_plane_coordinate_0))
+        face_part_edges.append(pl.get_part_edge_index(pl.to_units(p.get_part_length(face_part)), centre_index))
+
+    # parts split by a reveal are apart by the width of the reveal
+    gap = p.get_panel_spec().reveal_width + pl.length_tolerance
+    return pl.get_face_edges(part_edges, face_part_edges, gap)
+
+
+def auto_parts(__title__, part, displacement_distance, switch_option, multiple=True, probe=False, optimal=False):
+    """
+    Auto Identifies :
+    1. The part wall side ( exterior, interior or partition ) intuitively
+    2. The lap (right or left) to be used to be used intuitively
+    3. Direction to be used  right-> left or left->right by user choice
+    and places reveals along the wall's path's curve thus creating panels
+
+    :param multiple: Bool to determine single panel or multi-panel reveal distances
+    :param probe: Bool to establish the reveal at 0 with probe reveals instead of the wall's path curve
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces around openings
+    :param switch_option: Bool to switch direction of placing reveals: left to right/right to left
+    :param displacement_distance: Distance away from the edges of openings
+    :param part: Part to be panelized
+    :param __title__: tool title
+
+    :return: None
+    """
+    host_wall_id, lap_type_id, reveal_indexes, side_of_wall, part_edges = \
+        get_part_reveal_indexes(__title__, part, displacement_distance, switch_option, multiple, probe, optimal)
 
     # Place reveals creating panels
-    auto_panel(__title__, host_wall_id, lap_type_id, reveal_indexes, side_of_wall)
+    wall_sweeps = auto_panel(__title__, host_wall_id, lap_type_id, reveal_indexes, side_of_wall)
+
+    # record the run, to be reverted as a whole
+    journal = j.new_journal()
+    j.record_reveals(journal, p.get_element_id_value(host_wall_id), p.get_element_id_value(part.Id),
+                     [p.get_element_id_value(x.Id) for x in wall_sweeps])
+    j.save_journal(journal)
+
+
+def auto_parts_batch(__title__, parts, displacement_distance, switch_option, multiple=True, optimal=False,
+                     rebalance=False):
+    """
+    Panelize parts in a single transaction group, assimilated into one undo entry.
+    Reveals of all parts are planned first, against the model as it was, then applied.
+
+    :param multiple: Bool to determine single panel or multi-panel reveal distances
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces around openings
+    :param switch_option: Bool to switch direction of placing reveals: left to right/right to left
+    :param displacement_distance: Distance away from the edges of openings
+    :param parts: Collection of parts to be panelized
+    :param rebalance: Bool to re-plan the faces of the parts and move the reveals existing within them to the plan,
+     instead of adding to them
+    :param __title__: tool title
+
+    :return: collection of part id, error of the parts that could not be panelized
+    """
+    plans, failed_parts = plan_parts(__title__, parts, displacement_distance, switch_option, multiple, optimal,
+                                     face=rebalance)
+    failed_parts.extend(apply_plans(__title__, plans, rebalance))
+
+    return failed_parts
+
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> PLAN FUNCTIONS
+
+def plan_part(__title__, part, displacement_distance, switch_option, multiple=True, optimal=False, face=False):
+    """
+    Plan the reveals of a part without modifying the model, the reveal datum is never probed so no transaction is
+    started
+    :param multiple: Bool to determine single panel or multi-panel reveal distances
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces around openings
+    :param face: Bool to plan the whole face of the part, merged with the parts it is split from by reveals
+    :param switch_option: Bool to switch direction of placing reveals: left to right/right to left
+    :param displacement_distance: Distance away from the edges of openings
+    :param part: Part to be panelized
+    :param __title__: tool title
+
+    :return: plan, dict of part id, wall id, side of wall, lap type id, reveal indexes and part edges (units)
+    """
+    host_wall_id, lap_type_id, reveal_indexes, side_of_wall, part_edges = \
+        get_part_reveal_indexes(__title__, part, displacement_distance, switch_option, multiple, probe=False,
+                                optimal=optimal, face=face)
+
+    plan = {
+        "part_id": p.get_element_id_value(part.Id),
+        "wall_id": p.get_element_id_value(host_wall_id),
+        "side": "Exterior" if side_of_wall == WallSide.Exterior else "Interior",
+        "lap_type_id": p.get_element_id_value(lap_type_id),
+        "reveal_indexes": list(reveal_indexes),
+        "edges": list(part_edges),
+    }
+
+    return plan
+
+
+def plan_parts(__title__, parts, displacement_distance, switch_option, multiple=True, optimal=False, face=False):
+    """
+    Plan the reveals of parts without modifying the model
+    :param multiple: Bool to determine single panel or multi-panel reveal distances
+    :param optimal: Bool to use the layout with the fewest panels and sub-minimum pieces around openings
+    :param face: Bool to plan the whole faces of the parts, a face shared by several parts is planned once
+    :param switch_option: Bool to switch direction of placing reveals: left to right/right to left
+    :param displacement_distance: Distance away from the edges of openings
+    :param parts: Collection of parts to be panelized
+    :param __title__: tool title
+
+    :return: collection of plans, collection of part id, error of the parts that could not be planned
+    """
+    plans = []
+    failed_parts = []
+    faces = set()
+    for part in parts:
+        try:
+            plan = plan_part(__title__, part, displacement_distance, switch_option, multiple, optimal, face)
+        except Exception as error:
+            failed_parts.append((p.get_element_id_value(part.Id), error))
+            continue
+
+        if face:
+            face_key = (plan["wall_id"], plan["side"], tuple(plan["edges"]))
+            if face_key in faces:
+                continue
+            faces.add(face_key)
+
+        plans.append(plan)
+
+    return plans, failed_parts
+
+
+def apply_plans(__title__, plans, rebalance=False):
+    """
+    Create the reveals of plans in a single transaction group, assimilated into one undo entry.
+    Each plan is applied in its own transaction, a part that fails or is not committed is rolled back on its own.
+    The reveals created, moved and deleted are recorded in the run journal, to be reverted as a whole.
+    :param __title__: tool title
+    :param plans: collection of plans
+    :param rebalance: Bool to move the reveals existing within the edges of the plans to the plan, plans without
+     edges are added to the existing reveals
+
+    :return: collection of part id, error of the plans that could not be applied
+    """
+    failed_parts = []
+    journal = j.new_journal()
+
+    with TransactionGroup(doc, "Panelize") as tg:
+        tg.Start()
+
+        for plan in plans:
+            side_of_wall = WallSide.Exterior if plan["side"] == "Exterior" else WallSide.Interior
+
+            with Transaction(doc, __title__) as t:
+                t.Start("03. Panelize part")
+                options = t.GetFailureHandlingOptions()
+                failureProcessor = eh.WarningSwallower()
+                options.SetFailuresPreprocessor(failureProcessor)
+                t.SetFailureHandlingOptions(options)
+
+                moved, deleted = [], []
+                try:
+                    host_wall_id = ElementId(plan["wall_id"])
+                    lap_type_id = ElementId(plan["lap_type_id"])
+                    if rebalance and plan.get("edges") is not None:
+                        wall_sweeps, moved, deleted = rebalance_reveals(host_wall_id, lap_type_id,
+                                                                        plan["reveal_indexes"], side_of_wall,
+                                                                        plan["edges"])
+                    else:
+                        wall_sweeps = place_reveals(host_wall_id, lap_type_id, plan["reveal_indexes"], side_of_wall)
+                    status = t.Commit()
+                except Exception as error:
+                    if t.HasStarted():
+                        t.RollBack()
+                    failed_parts.append((plan["part_id"], error))
+                    continue
+
+            # the part is rolled back on its own by the failure processing, the other parts are kept
+            if status != TransactionStatus.Committed:
+                failed_parts.append((plan["part_id"], eh.RevealNotCreatedError()))
+                continue
+
+            j.record_reveals(journal, plan["wall_id"], plan["part_id"],
+                             [p.get_element_id_value(x.Id) for x in wall_sweeps])
+            for reveal_id, distance, type_id in moved:
+                j.record_moved_reveal(journal, reveal_id, distance, type_id)
+            for distance, type_id in deleted:
+                j.record_deleted_reveal(journal, plan["wall_id"], plan["side"], distance, type_id)
+
+        tg.Assimilate()
+
+    j.save_journal(journal)
+
+    return failed_parts
 
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> DELETE TRANSACTIONS
@@ -220,6 +535,28 @@ def delete_element(__title__, *args):
 
     :return: None
     """
+    delete_elements(__title__, args)
+
+
+def delete_elements(__title__, element_ids):
+    """
+    Delete elements in revit with a single delete call, regenerating the model once
+    :param __title__: tool title
+    :param element_ids: iterable of Element Ids to be deleted
+
+    :return: collection of Element Ids already deleted
+    """
+    existing_ids = List[ElementId]()
+    missing_ids = []
+    for element_id in element_ids:
+        if doc.GetElement(element_id) is None:
+            missing_ids.append(element_id)
+        else:
+            existing_ids.Add(element_id)
+
+    if existing_ids.Count == 0:
+        return missing_ids
+
     with Transaction(doc, __title__) as t:
         t.Start("02. Delete reveals")
 
@@ -227,31 +564,99 @@ def delete_element(__title__, *args):
         failureProcessor = eh.WarningSwallower()
         options.SetFailuresPreprocessor(failureProcessor)
         t.SetFailureHandlingOptions(options)
-        for element_id in args:
-            doc.Delete(element_id)
+        doc.Delete(existing_ids)
         status = t.Commit()
 
         if status != TransactionStatus.Committed:
             # if transaction has not been rollback. Could not therefore delete elements
             raise eh.DeleteElementsError
 
+    return missing_ids
 
-# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> GRAPHICS TRANSACTIONS
 
-def highlight_unpanelized_underpanelized_parts(__title__):
+def restore_reveals(__title__, moved_reveals, deleted_reveals):
     """
-    Highlight unpanelized and underpanelized parts by color
-    :param __title__: Tool title
-    :return: Graphics settings for unpanelized and panelized parts
+    Move the reveals moved by a rebalance back and recreate the reveals it deleted
+    :param __title__: tool title
+    :param moved_reveals: dictionary of reveal id (int) to distance (feet), wall sweep type id (int) before the run
+    :param deleted_reveals: collection of host wall id (int), side, distance (feet), wall sweep type id (int)
+
+    :return: number of reveals restored
+    """
+    restored = 0
+    with Transaction(doc, __title__) as t:
+        t.Start("04. Restore reveals")
+
+        options = t.GetFailureHandlingOptions()
+        failureProcessor = eh.WarningSwallower()
+        options.SetFailuresPreprocessor(failureProcessor)
+        t.SetFailureHandlingOptions(options)
+
+        for reveal_id, (distance, lap_type_id) in moved_reveals.items():
+            reveal = doc.GetElement(ElementId(reveal_id))
+            if reveal is None:
+                continue
+            if p.get_element_id_value(reveal.GetTypeId()) != lap_type_id:
+                reveal.ChangeTypeId(ElementId(lap_type_id))
+            wall_sweep_info = reveal.GetWallSweepInfo()
+            wall_sweep_info.Distance = distance
+            reveal.ChangeWallSweepInfo(wall_sweep_info)
+            restored += 1
+
+        for wall_id, side, distance, lap_type_id in deleted_reveals:
+            host_wall_id = ElementId(wall_id)
+            if doc.GetElement(host_wall_id) is None:
+                continue
+            side_of_wall = WallSide.Exterior if side == "Exterior" else WallSide.Interior
+            p.create_reveal(host_wall_id, ElementId(lap_type_id), distance, side_of_wall)
+            restored += 1
+
+        status = t.Commit()
+
+        if status != TransactionStatus.Committed:
+            raise eh.RevealNotCreatedError
+
+    return restored
+
+
+def revert_last_run(__title__):
+    """
+    Revert the last panelization run recorded in the run journal, as a single undo entry.
+    The reveals created are deleted, the reveals a rebalance moved or deleted are restored.
+    :param __title__: tool title
+
+    :return: number of reveals recorded, number of reveals already deleted, number of reveals restored.
+     None if no run has been recorded
     """
+    journal = j.load_journal()
+    if journal is None:
+        return None
+
+    reveal_ids = [ElementId(x) for x in j.get_reveal_ids(journal)]
+    moved_reveals = j.get_moved_reveals(journal)
+    deleted_reveals = j.get_deleted_reveals(journal)
+
+    with TransactionGroup(doc, "Revert panelization") as tg:
+        tg.Start()
+        missing_ids = delete_elements(__title__, reveal_ids)
+        restored = 0
+        if len(moved_reveals) != 0 or len(deleted_reveals) != 0:
+            restored = restore_reveals(__title__, moved_reveals, deleted_reveals)
+        tg.Assimilate()
+
+    j.clear_journal()
 
-    # select all parts
-    parts = p.select_all_parts()
-    exterior_parts, interior_parts = p.sort_parts_by_side(parts)
-    filtered_parts = exterior_parts + interior_parts
-    underpanalized, panelized, unpanelized = p.sort_parts_by_length(filtered_parts)
+    return len(reveal_ids), len(missing_ids), restored
 
-    solid_fill_id = ElementId(20)
+
+# >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> GRAPHICS TRANSACTIONS
+
+def get_highlight_graphics_settings():
+    """
+    Establish the graphics settings highlighting unpanelized and underpanelized parts by color
+    :return: Graphics settings for unpanelized and underpanelized parts
+    """
+    solid_fill_id = ElementId(r.get_registry().solid_fill_id)
 
     # color codes - unpanelized
     graphics_settings_unpanelized = OverrideGraphicSettings()
@@ -267,6 +672,28 @@ def highlight_unpanelized_underpanelized_parts(__title__):
     color_underpanelized_b = Color(clr_bytes_b[0], clr_bytes_b[1], clr_bytes_b[2])
     graphics_settings_underpanelized.SetSurfaceForegroundPatternColor(color_underpanelized_b)
 
+    return graphics_settings_unpanelized, graphics_settings_underpanelized
+
+
+def highlight_unpanelized_underpanelized_parts(__title__, use_filters=False):
+    """
+    Highlight unpanelized and underpanelized parts by color
+    :param __title__: Tool title
+    :param use_filters: Bool to highlight with view filters on the part length instead of per part overrides
+    :return: Graphics settings for unpanelized and panelized parts
+    """
+    if use_filters:
+        return highlight_parts_with_filters(__title__)
+
+    # select unpanelized and underpanelized parts, filtered by length and layer index in Revit
+    layer_indexes = p.get_panelized_layer_indexes()
+    exterior_parts, interior_parts = p.sort_parts_by_side(p.select_all_parts(1, layer_indexes))
+    unpanelized = exterior_parts + interior_parts
+    exterior_parts, interior_parts = p.sort_parts_by_side(p.select_all_parts(-1, layer_indexes))
+    underpanalized = exterior_parts + interior_parts
+
+    graphics_settings_unpanelized, graphics_settings_underpanelized = get_highlight_graphics_settings()
+
     with Transaction(doc, __title__) as t:
         t.Start()
         if len(unpanelized) != 0:
@@ -276,15 +703,160 @@ def highlight_unpanelized_underpanelized_parts(__title__):
             for part in underpanalized:
                 active_view.SetElementOverrides(part.Id, graphics_settings_underpanelized)
 
-        t.Commit()
+        status = t.Commit()
+
+    # record the overrides applied, to be reset without scanning the view
+    if status == TransactionStatus.Committed:
+        overrides = j.load_data(overrides_file_id) or {}
+        view_key = str(p.get_element_id_value(active_view.Id))
+        part_ids = set(overrides.get(view_key, []))
+        part_ids.update(p.get_element_id_value(part.Id) for part in unpanelized + underpanalized)
+        overrides[view_key] = sorted(part_ids)
+        j.save_data(overrides_file_id, overrides)
 
     return graphics_settings_unpanelized, graphics_settings_underpanelized
 
 
-def remove_graphics(__title__):
+def get_highlight_filter(filter_name, length_class, layer_indexes=None):
     """
-    Reset graphics for unpanelized parts that have been panelized (under development)
-    :param __title__: Tool title
+    Create or update a view filter of parts by length and layer index, within an open transaction
+    :param filter_name: name of the filter
+    :param length_class: -1 underpanelized, 1 unpanelized
+    :param layer_indexes: collection of layer indexes of the parts, all layers if None
+    :return: ParameterFilterElement
+    """
+    element_filter = p.get_length_filter(length_class, p.get_panel_spec())
+    if layer_indexes is not None:
+        element_filter = LogicalAndFilter(element_filter, p.get_layer_index_filter(layer_indexes))
+
+    for filter_element in FilteredElementCollector(doc).OfClass(ParameterFilterElement):
+        if filter_element.Name == filter_name:
+            filter_element.SetElementFilter(element_filter)
+            return filter_element
+
+    category_ids = List[ElementId]([ElementId(BuiltInCategory.OST_Parts)])
+    return ParameterFilterElement.Create(doc, filter_name, category_ids, element_filter)
+
+
+def is_filters_controlled(view):
+    """
+    Determine if the filters of a view are controlled by its view template
+    :param view: view
+    :return: Bool
+    """
+    view_template = doc.GetElement(view.ViewTemplateId)
+    if view_template is None:
+        return False
+
+    filters_id = ElementId(BuiltInParameter.VIS_GRAPHICS_FILTERS)
+    return filters_id not in view_template.GetNonControlledTemplateParameterIds()
+
+
+def check_highlight_view(view):
+    """
+    Check view filters can be applied to a view
+    :param view: view to be highlighted
     :return: None
     """
-    pass
+    if not view.AreGraphicsOverridesAllowed():
+        raise eh.HighlightFiltersError("The active view does not allow graphic overrides")
+
+    if is_filters_controlled(view):
+        raise eh.HighlightFiltersError("The filters of the active view are controlled by its view template")
+
+
+def highlight_parts_with_filters(__title__):
+    """
+    Highlight unpanelized and underpanelized parts by color with two view filters on the part length and layer index.
+    The cost is the same for any number of parts, parts are highlighted as they are split.
+    :param __title__: Tool title
+    :return: Graphics settings for unpanelized and panelized parts
+    """
+    check_highlight_view(active_view)
+
+    graphics_settings_unpanelized, graphics_settings_underpanelized = get_highlight_graphics_settings()
+    layer_indexes = p.get_panelized_layer_indexes()
+    if layer_indexes is not None and len(layer_indexes) == 0:
+        return graphics_settings_unpanelized, graphics_settings_underpanelized
+
+    with Transaction(doc, __title__) as t:
+        t.Start("04. Highlight parts")
+        try:
+            highlight_filters = [
+                (get_highlight_filter(highlight_filter_names[0], 1, layer_indexes), graphics_settings_unpanelized),
+                (get_highlight_filter(highlight_filter_names[1], -1, layer_indexes), graphics_settings_underpanelized)]
+
+            for filter_element, graphics_settings in highlight_filters:
+                if not active_view.IsFilterApplied(filter_element.Id):
+                    active_view.AddFilter(filter_element.Id)
+                active_view.SetFilterOverrides(filter_element.Id, graphics_settings)
+        except Exception as error:
+            t.RollBack()
+            raise eh.HighlightFiltersError(str(error))
+
+        status = t.Commit()
+
+        if status != TransactionStatus.Committed:
+            raise eh.HighlightFiltersError("The highlight filters could not be applied")
+
+    return graphics_settings_unpanelized, graphics_settings_underpanelized
+
+
+def remove_graphics(__title__, all_parts=False):
+    """
+    Reset graphics of parts highlighted by color that have been panelized since, or of all parts highlighted.
+    Parts are established from the record of overrides applied, not by scanning the views.
+    :param __title__: Tool title
+    :param all_parts: Bool to reset all parts highlighted and remove the highlight filters from every view and
+     view template they are applied to, views whose filters are controlled by a template follow the template
+    :return: number of parts reset
+    """
+    overrides = j.load_data(overrides_file_id) or {}
+    panel_spec = p.get_panel_spec()
+    reset_settings = OverrideGraphicSettings()
+    reset = 0
+
+    with Transaction(doc, __title__) as t:
+        t.Start("05. Reset graphics")
+
+        for view_key in list(overrides.keys()):
+            view = doc.GetElement(ElementId(int(view_key)))
+            if view is None:
+                del overrides[view_key]
+                continue
+
+            remaining_part_ids = []
+            for part_id in overrides[view_key]:
+                part = doc.GetElement(ElementId(part_id))
+                if part is None:
+                    continue
+                part_length = pl.to_units(part.get_Parameter(BuiltInParameter.DPART_LENGTH_COMPUTED).AsDouble())
+                if all_parts or pl.classify_part_length(part_length, panel_spec) == 0:
+                    view.SetElementOverrides(part.Id, reset_settings)
+                    reset += 1
+                else:
+                    remaining_part_ids.append(part_id)
+
+            if len(remaining_part_ids) != 0:
+                overrides[view_key] = remaining_part_ids
+            else:
+                del overrides[view_key]
+
+        if all_parts:
+            filter_ids = [x.Id for x in FilteredElementCollector(doc).OfClass(ParameterFilterElement)
+                          if x.Name in highlight_filter_names]
+
+            if len(filter_ids) != 0:
+                for view in FilteredElementCollector(doc).OfClass(View):
+                    if not view.AreGraphicsOverridesAllowed() or is_filters_controlled(view):
+                        continue
+                    for filter_id in filter_ids:
+                        if view.IsFilterApplied(filter_id):
+                            view.RemoveFilter(filter_id)
+
+        status = t.Commit()
+
+    if status == TransactionStatus.Committed:
+        j.save_data(overrides_file_id, overrides)
+
+    return reset
@@ -24,6 +24,8 @@ clr.AddReference("System")
 from _create import _transactions as a
 from _create import _parts as g
 from _create import _forms as f
+from _create import _coordinate as c
+from _create import _openings as o
 from _create import _errorhandler as eh
 from pyrevit import forms
 # VARIABLES
@@ -40,25 +42,42 @@ active_level = doc.ActiveView.GenLevel
 
 
 def main():
-    selected_parts = g.select_all_parts()
+    try:
+        # wall frames, hosted openings and parts are read once for the run,
+        # existing reveals are read from the model for each wall side they are placed on
+        c.clear_wall_frames()
+        o.clear_hosted_fenestrations_index()
+        g.clear_part_tables()
 
-    exterior_parts, interior_parts = g.sort_parts_by_side(selected_parts)
-    all_parts = exterior_parts + interior_parts
-    underpanelized, panalized, non_panelized_parts = g.sort_parts_by_length(all_parts)
+        # only parts longer than a panel, of the layers panelized, are returned by Revit
+        selected_parts = g.select_all_parts(length_class=1, layer_indexes=g.get_panelized_layer_indexes())
 
-    if len(non_panelized_parts) != 0:
-        switch_option = f.form_switch_panelization_direction()
-        displacement_distance = f.form_displacement_distance()
-        for part in non_panelized_parts:
+        exterior_parts, interior_parts = g.sort_parts_by_side(selected_parts)
+        non_panelized_parts = exterior_parts + interior_parts
+
+        if len(non_panelized_parts) != 0:
+            switch_option = f.form_switch_panelization_direction()
+            displacement_distance = f.form_displacement_distance()
+            optimal = f.form_layout_mode()
+            rebalance = f.form_existing_reveals()
+
+            # all parts are panelized as a single undo entry
+            failed_parts = a.auto_parts_batch(__title__, non_panelized_parts, displacement_distance, switch_option,
+                                              multiple=True, optimal=optimal, rebalance=rebalance)
+
+            f.form_failed_parts(failed_parts)
+
+            # view filters highlight the parts as split by the reveals, without reading them again
             try:
-                a.auto_parts(__title__, part, displacement_distance, switch_option, multiple=True)
-            except Exception:
-                pass
+                a.highlight_parts_with_filters(__title__)
+            except eh.HighlightFiltersError as error:
+                forms.alert("Parts could not be highlighted", sub_msg=str(error))
 
-        a.highlight_unpanelized_underpanelized_parts(__title__)
+        else:
+            forms.alert("There are no non-panelized parts")
 
-    else:
-        forms.alert("There are no non-panelized parts")
+    except (eh.LapTypeNotFoundError, eh.HighlightFiltersError) as error:
+        forms.alert(f.get_error_alert(error), sub_msg=str(error))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+from __future__ import division
+
+# METADATA
+
+__title__ = "ApplyPlan"
+
+__doc__ = """
+Select a panelization plan file exported by DryRun and apply it
+"""
+__author__ = "Symon Kipkemei"
+__helpurl__ = "https://www.linkedin.com/in/symon-kipkemei/"
+
+__min_revit_ver__ = 2020
+__max_revit_ver__ = 2025
+
+# IMPORTS
+################################################################################################################################
+
+from Autodesk.Revit.DB import *
+import clr
+
+clr.AddReference("System")
+
+from _create import _transactions as a
+from _create import _planfile as pf
+from _create import _errorhandler as eh
+from _create import _forms as f
+from pyrevit import forms
+
+# VARIABLES
+################################################################################################################################
+
+# __revit__  used to create an instance
+app = __revit__.Application  # represents the Revit Autodesk Application
+doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
+uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
+
+
+def main():
+    file_path = forms.pick_file(file_ext='json')
+    if not file_path:
+        return
+
+    try:
+        plans, document_title = pf.import_plans(file_path)
+    except ValueError:
+        forms.alert("The selected file is not a valid panelization plan")
+        return
+
+    if document_title != doc.Title:
+        if not forms.alert("The plan was made on '{}'. Apply it to '{}'?".format(document_title, doc.Title),
+                           yes=True, no=True):
+            return
+
+    # the plan is replayed as is, no datum or openings are queried. Reveals already placed are skipped
+    failed_parts = a.apply_plans(__title__, plans)
+
+    if len(failed_parts) != 0:
+        forms.alert("{} of {} part plans could not be applied".format(len(failed_parts), len(plans)))
+        f.form_failed_parts(failed_parts)
+
+
+if __name__ == "__main__":
+    main()
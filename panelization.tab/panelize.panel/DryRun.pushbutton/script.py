@@ -0,0 +1,86 @@
+from __future__ import division
+
+# METADATA
+
+__title__ = "DryRun"
+
+__doc__ = """
+Select Multiple/Single Part(s) and plan the panelization without modifying the model
+"""
+__author__ = "Symon Kipkemei"
+__helpurl__ = "https://www.linkedin.com/in/symon-kipkemei/"
+
+__min_revit_ver__ = 2020
+__max_revit_ver__ = 2025
+
+# IMPORTS
+################################################################################################################################
+
+from Autodesk.Revit.DB import *
+import clr
+
+clr.AddReference("System")
+
+from timeit import default_timer as timer
+
+from _create import _transactions as a
+from _create import _parts as p
+from _create import _forms as f
+from _create import _errorhandler as eh
+from _create import _coordinate as c
+from _create import _openings as o
+from _create import _planner as pl
+from _create import _planfile as pf
+from pyrevit import forms
+
+# VARIABLES
+################################################################################################################################
+
+# __revit__  used to create an instance
+app = __revit__.Application  # represents the Revit Autodesk Application
+doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
+uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
+
+
+def main():
+    try:
+        # wall frames and hosted openings are computed once for the run
+        c.clear_wall_frames()
+        o.clear_hosted_fenestrations_index()
+
+        parts = p.select_parts()
+        switch_option = f.form_switch_panelization_direction()
+        displacement_distance = f.form_displacement_distance()
+        optimal = f.form_layout_mode()
+
+        # planning only reads the model, the reveal datum is derived from the wall path curves without probe reveals,
+        # so no transaction is started
+        start = timer()
+        plans, failed_parts = a.plan_parts(__title__, parts, displacement_distance, switch_option, multiple=True,
+                                           optimal=optimal)
+        elapsed = timer() - start
+
+        data = []
+        for plan in plans:
+            distances = ", ".join([str(round(pl.to_feet(x), 4)) for x in plan["reveal_indexes"]])
+            data.append([plan["part_id"], plan["wall_id"], plan["side"], plan["lap_type_id"],
+                         len(plan["reveal_indexes"]), distances])
+        for part_id, error in failed_parts:
+            data.append([part_id, "-", "-", "-", 0, "Not planned: " + type(error).__name__])
+
+        header = ["PART", "WALL", "SIDE", "LAP TYPE", "REVEALS", "DISTANCES (F)"]
+        f.form_display_table(data, header, "Panelization Plan - {} parts in {:.2f}s".format(len(parts), elapsed),
+                             last_line_color='')
+
+        # plans are exported for review and replayed later with ApplyPlan
+        if len(plans) != 0 and forms.alert("Export the plan to a file?", yes=True, no=True):
+            file_path = forms.save_file(file_ext='json', default_name=doc.Title + "-plan")
+            if file_path:
+                pf.export_plans(file_path, plans, doc.Title)
+
+    except (eh.LapTypeNotFoundError, eh.HighlightFiltersError) as error:
+        forms.alert(f.get_error_alert(error), sub_msg=str(error))
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,8 @@ from _create import _transactions as a
 from _create import _parts as p
 from _create import _errorhandler as eh
 from _create import _forms as f
+from _create import _coordinate as c
+from _create import _openings as o
 from pyrevit import forms
 
 # VARIABLES
@@ -41,24 +43,27 @@ active_level = doc.ActiveView.GenLevel
 
 
 def main():
-    parts = p.select_parts()
-    switch_option = f.form_switch_panelization_direction()
-    displacement_distance = f.form_displacement_distance()
-    for part in parts:
-        try:
-            a.auto_parts(__title__, part, displacement_distance, switch_option, multiple=True)
-        except eh.RevealNotCreatedError:
-            forms.alert('Reveal at coordinate 0 could not be created')
-        except eh.CentreIndexError:
-            forms.alert("Centre Index could not be established")
-        except eh.VariableDistanceNotFoundError:
-            forms.alert("The variable distance could not be established")
-        except eh.DeleteElementsError:
-            forms.alert('Error occurred. Could not delete reveals')
-        except eh.XYAxisPlaneNotEstablishedError:
-            forms.alert('Could not Panelize. Selected Part not on X or Y axis')
-        except Exception:
-            pass
+    try:
+        # wall frames, hosted openings and parts are read once for the run,
+        # existing reveals are read from the model for each wall side they are placed on
+        c.clear_wall_frames()
+        o.clear_hosted_fenestrations_index()
+        p.clear_part_tables()
+
+        parts = p.select_parts()
+        switch_option = f.form_switch_panelization_direction()
+        displacement_distance = f.form_displacement_distance()
+        optimal = f.form_layout_mode()
+        rebalance = f.form_existing_reveals()
+
+        # all parts are panelized as a single undo entry, a failing part is rolled back on its own
+        failed_parts = a.auto_parts_batch(__title__, parts, displacement_distance, switch_option, multiple=True,
+                                          optimal=optimal, rebalance=rebalance)
+
+        f.form_failed_parts(failed_parts)
+
+    except (eh.LapTypeNotFoundError, eh.HighlightFiltersError) as error:
+        forms.alert(f.get_error_alert(error), sub_msg=str(error))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+from __future__ import division
+
+# METADATA
+
+__title__ = "RevertRun"
+
+__doc__ = """
+Revert the last panelization run, deleting the reveals it created
+"""
+__author__ = "Symon Kipkemei"
+__helpurl__ = "https://www.linkedin.com/in/symon-kipkemei/"
+
+__min_revit_ver__ = 2020
+__max_revit_ver__ = 2025
+
+# IMPORTS
+################################################################################################################################
+
+from Autodesk.Revit.DB import *
+import clr
+
+clr.AddReference("System")
+
+from _create import _transactions as a
+from _create import _errorhandler as eh
+from pyrevit import forms
+
+# VARIABLES
+################################################################################################################################
+
+# __revit__  used to create an instance
+app = __revit__.Application  # represents the Revit Autodesk Application
+doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
+uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
+
+
+def main():
+    try:
+        reverted = a.revert_last_run(__title__)
+    except eh.DeleteElementsError:
+        forms.alert('Error occurred. Could not delete reveals')
+        return
+    except eh.RevealNotCreatedError:
+        forms.alert('Error occurred. Could not restore reveals')
+        return
+
+    if reverted is None:
+        forms.alert("There is no panelization run to revert")
+        return
+
+    recorded, missing, restored = reverted
+    forms.alert("Deleted {} reveals of the last run ({} already deleted), restored {} reveals".format(
+        recorded - missing, missing, restored))
+
+
+if __name__ == "__main__":
+    main()
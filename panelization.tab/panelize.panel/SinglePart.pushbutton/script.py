@@ -39,6 +39,9 @@ active_level = doc.ActiveView.GenLevel
 
 def main():
     try:
+        # parts split or moved by an earlier run are read again
+        g.clear_part_tables()
+
         part = g.select_part()
         # switch direction of panelization
         switch_option = f.form_switch_panelization_direction()
@@ -60,6 +63,9 @@ def main():
     except eh.DeleteElementsError:
         forms.alert('Error occurred. Could not delete reveals')
 
+    except eh.LapTypeNotFoundError as error:
+        forms.alert(f.get_error_alert(error), sub_msg=str(error))
+
    #except Exception:
         #forms.alert("Error occurred.Could not panelize selected Part.")
 
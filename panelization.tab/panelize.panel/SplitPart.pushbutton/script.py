@@ -16,6 +16,7 @@ __max_revit_ver__ = 2025
 from _create import _transactions as t
 from _create import _parts as p
 from _create import _errorhandler as eh
+from _create import _forms as f
 import clr
 clr.AddReference("System")
 from pyrevit import forms
@@ -34,6 +35,9 @@ active_level = doc.ActiveView.GenLevel
 def main():
     """Auto split tool"""
     try:
+        # parts split or moved by an earlier run are read again
+        p.clear_part_tables()
+
         part = p.select_part()
         host_wall_id = p.get_host_wall_id(part)
         host_wall_type_id = p.get_host_wall_type_id(host_wall_id)
@@ -53,6 +57,8 @@ def main():
         forms.alert('Error occurred. Could not delete reveals')
     except eh.XYAxisPlaneNotEstablishedError:
         forms.alert('Could not Panelize. Selected Part not on X or Y axis')
+    except eh.LapTypeNotFoundError as error:
+        forms.alert(f.get_error_alert(error), sub_msg=str(error))
     except Exception:
         forms.alert("Error occurred.Could not split part")
 
@@ -0,0 +1,56 @@
+# METADATA
+__title__ = "MultiFaceReveals"
+
+__doc__ = """
+Select all reveals on the faces of multiple reveals selected, across walls
+"""
+
+__author__ = "Symon Kipkemei"
+__helpurl__ = "https://www.linkedin.com/in/symon-kipkemei/"
+
+__min_revit_ver__ = 2020
+__max_revit_ver__ = 2025
+
+# IMPORTS
+
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.DB import Transaction, Element, ElementId, FilteredElementCollector
+from Autodesk.Revit.DB.Structure import StructuralType
+from Autodesk.Revit.UI.Selection import ObjectType
+from Autodesk.Revit.UI.Selection import ISelectionFilter
+
+from _create import _reveals as rv
+from _create import _errorhandler as eh
+
+import clr
+
+clr.AddReference("System")
+clr.AddReference('System.Collections')
+
+from System.Collections.Generic import List, ICollection
+from pyrevit import forms
+
+# VARIABLES
+app = __revit__.Application  # represents the Revit Autodesk Application
+doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
+uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
+
+active_view = doc.ActiveView
+active_level = doc.ActiveView.GenLevel
+
+# FUNCTIONS
+
+def main():
+    try:
+        reveals = rv.select_reveals()
+    except eh.RevealNotSelectedError:
+        forms.alert("Select a reveal on each face")
+        return
+
+    # reveals on the faces are looked up in the session face index, deleted reveals are dropped from it
+    filtered_reveals = rv.get_face_reveal_ids(reveals)
+    uidoc.Selection.SetElementIds(List[ElementId](filtered_reveals))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,7 @@ from Autodesk.Revit.DB.Structure import StructuralType
 from Autodesk.Revit.UI.Selection import ObjectType
 from Autodesk.Revit.UI.Selection import ISelectionFilter
 
-from _create import _parts as g
-from _create import _transactions as a
+from _create import _reveals as rv
 from _create import _errorhandler as eh
 
 import clr
@@ -41,114 +40,16 @@ active_level = doc.ActiveView.GenLevel
 
 # FUNCTIONS
 
-import clr
-
-
-class RevealSelectionFilter(ISelectionFilter):
-    """
-    a class to filter selections to reveals only
-    """
-
-    def AllowElement(self, element):
-        if element.Category.Name == "Reveals":
-            return True
-        return False
-
-    def AllowReference(self, refer, point):
-        return False
-
-
-# select a reveal
-def select_reveal():
-    """
-    Selects a reveal
-    :return:A reveal
-    """
-    reveal_filter = RevealSelectionFilter()
-    reference = uidoc.Selection.PickObject(ObjectType.Element, reveal_filter)
-    reveal = uidoc.Document.GetElement(reference)
-    if str(type(reveal)) == "<type 'WallSweep'>":
-        return reveal
-    else:
-        raise eh.RevealNotSelectedError
-
-
-# identify the host id
-
-
-def get_wall_side(reveal):
-    """
-    Determine the wall side of the reveal
-    :param reveal: reveal
-    :return: wall side
-    """
-    wall_sweep_info = reveal.GetWallSweepInfo()
-    wall_side = wall_sweep_info.WallSide
-    return wall_side
-
-
-def get_host_wall_id(reveal):
-    """
-    Abstract the host wall id of a  selected reveal
-    :param reveal: Reveal
-    :return: host wall Element Id
-    """
-    host_ids = reveal.GetHostIds()
-    host_id = host_ids[0]
-
-    return host_id
-
-
-# select all reveals that have similar id and face
-
-
-def select_all_reveals():
-    """
-    Select all reveals in a project
-    :return: Collection of all reveals
-    """
-    all_reveals = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Reveals). \
-        WhereElementIsNotElementType().ToElements()
-
-    return all_reveals
-
-
-def get_filtered_reveals(reference_host_id, reference_wall_side, all_reveals):
-    """
-    Filter reveals based on the host wall and the wall side
-    :param reference_host_id:
-    :param reference_wall_side:
-    :param all_reveals:
-    :return:
-    """
-    filtered_reveals = []
-    for reveal in all_reveals:
-        wall_side = get_wall_side(reveal)
-        host_id = get_host_wall_id(reveal)
-
-        if wall_side == reference_wall_side and host_id == reference_host_id:
-            filtered_reveals.append(reveal.Id)
-
-    return filtered_reveals
-
-
-def display_selected_reveals(filtered_reveals):
-    """Display all selected reveals"""
-    uidoc.Selection.SetElementIds(filtered_reveals)
-
-
-# filter reveals to same host id and face
-
 def main():
-    reveal = select_reveal()
-    reference_host_id = get_host_wall_id(reveal)
-    reference_wall_side = get_wall_side(reveal)
-    all_reveals = select_all_reveals()
-    filtered_reveals = get_filtered_reveals(reference_host_id, reference_wall_side, all_reveals)
-
-    # Create a C# List[int] and add the Python list elements to it
-    filtered_reveals_collection = List[ElementId](filtered_reveals)
-    display_selected_reveals(filtered_reveals_collection)
+    try:
+        reveal = rv.select_reveal()
+    except eh.RevealNotSelectedError:
+        forms.alert("Select a reveal")
+        return
+
+    # reveals on the face are looked up in the session face index, deleted reveals are dropped from it
+    filtered_reveals = rv.get_face_reveal_ids([reveal])
+    uidoc.Selection.SetElementIds(List[ElementId](filtered_reveals))
 
 
 if __name__ == "__main__":
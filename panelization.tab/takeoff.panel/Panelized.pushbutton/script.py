@@ -26,6 +26,8 @@ from _create import _transactions as a
 from _create import _parts as g
 
 from _create import _forms as f
+from _create import _errorhandler as eh
+from _create import _takeoff as tk
 from pyrevit import forms
 import clr
 
@@ -45,73 +47,30 @@ active_level = doc.ActiveView.GenLevel
 
 
 def get_parts_data(filtered_parts):
-    """Abstract parts data : height,length, thickness, volume, base level and area"""
-    parts_data = {}
+    """
+    Abstract parts data : height, length (units), thickness, volume, base level and area.
+    Heights, lengths and areas are read from the part table
+    """
+    table = g.get_part_table()
+    parts_data = []
 
     for part in filtered_parts:
-        # abstract length, height and index from model
-        parts_id = part.Id
-
-        height = part.get_Parameter(BuiltInParameter.DPART_HEIGHT_COMPUTED).AsValueString()
-        length = part.get_Parameter(BuiltInParameter.DPART_LENGTH_COMPUTED).AsValueString()
+        row = table.get_row(part)
         thickness = part.get_Parameter(BuiltInParameter.DPART_LAYER_WIDTH).AsDouble()
         volume = part.get_Parameter(BuiltInParameter.DPART_VOLUME_COMPUTED).AsDouble()
         base_level = part.get_Parameter(BuiltInParameter.DPART_BASE_LEVEL).AsDouble()
-        area = part.get_Parameter(BuiltInParameter.DPART_AREA_COMPUTED).AsDouble()
 
-        part_type = height + " x " + length
-
-        parts_data[parts_id] = [part_type, height, length, thickness, volume, base_level, area]
+        parts_data.append((table.heights[row], table.lengths[row], thickness, volume, base_level, table.areas[row]))
 
     return parts_data
 
 
-def get_parts_type_data(parts_data):
-    """Aggregate parts data of similar length and height
-    :param parts_data:
-    :return:
-    """
-
-    data = {}
-    for part_data in parts_data.values():  # the default type
-        default_part_type = part_data[0]
-        count = 0
-        for part in parts_data.values():
-            part_type = part[0]
-
-            if default_part_type == part_type:
-                count += 1
-
-        data[default_part_type] = count
-
-    return data
-
+def get_part_labels(part):
+    """Abstract the height and length of a part as displayed in Revit"""
+    height = part.get_Parameter(BuiltInParameter.DPART_HEIGHT_COMPUTED).AsValueString()
+    length = part.get_Parameter(BuiltInParameter.DPART_LENGTH_COMPUTED).AsValueString()
 
-def get_summary_data(parts_data, parts_type_data, cost_per_sf):
-    """Sum up parts data into total panels, area and cost"""
-    final_data = []
-    sum_panels = 0
-    sum_area = 0
-    sum_cost = 0
-
-    for part_type, count in parts_type_data.items():
-        for part in parts_data.values():
-            if part_type == part[0]:
-                total_area = count * part[6]
-                total_cost = total_area * cost_per_sf
-                combine_data = part[1:] + [count] + [total_area] + [cost_per_sf] + [total_cost]
-                final_data.append(combine_data)
-
-                sum_panels += count
-                sum_area += total_area
-                sum_cost += total_cost
-
-                break
-
-    sum_total = ["-", "-", "-", "-", "-", "-", sum_panels, sum_area, "-", sum_cost]
-    final_data.append(sum_total)
-
-    return final_data
+    return height, length
 
 
 def user_filters_part_type(exterior_parts,interior_parts):
@@ -140,43 +99,47 @@ def user_filters_part_type(exterior_parts,interior_parts):
 
 
 def main():
-    # select all parts
-    parts = g.select_all_parts()
-    exterior_parts, interior_parts = g.sort_parts_by_side(parts)
-    filtered_parts, user_choice = user_filters_part_type(exterior_parts, interior_parts)
+    try:
+        # the part table is read again for the run, in a single pass over the parts of the document
+        g.clear_part_tables()
 
-    # filter by length, take off of panelized and underpanalized parts
-    underpanalized, panelized, unpanalized = g.sort_parts_by_length(filtered_parts)
+        # select all parts of the layers panelized
+        parts = g.select_all_parts(layer_indexes=g.get_panelized_layer_indexes())
+        exterior_parts, interior_parts = g.sort_parts_by_side(parts)
+        filtered_parts, user_choice = user_filters_part_type(exterior_parts, interior_parts)
 
-    selected_parts = underpanalized + panelized
+        # filter by length, take off of panelized and underpanalized parts
+        underpanalized, panelized, unpanalized = g.sort_parts_by_length(filtered_parts)
 
-    if len(selected_parts) != 0:
-        cost_per_sf = float(f.form_estimated_cost())
+        selected_parts = underpanalized + panelized
 
-        # filter to parts that have been panelized
-        parts_data = get_parts_data(selected_parts)
-        parts_type_data = get_parts_type_data(parts_data)
+        if len(selected_parts) != 0:
+            cost_per_sf = float(f.form_estimated_cost())
 
-        final_data = get_summary_data(parts_data, parts_type_data, cost_per_sf)
+            # filter to parts that have been panelized, grouped by height and length in a single pass
+            parts_data = get_parts_data(selected_parts)
+            final_data = tk.get_summary_data(parts_data, cost_per_sf, lambda i: get_part_labels(selected_parts[i]))
 
-        # display panels data
-        header = ["HEIGHT(F)", "LENGTH(F)", "THICKNESS(F)", "VOLUME (CF) ", "BASE LEVEL", "AREA (SF)", "COUNT",
-                  "TOTAL AREA(SF)",
-                  "COST PER SF (USD)", " COST(USD)"]
+            # display panels data
+            header = ["HEIGHT(F)", "LENGTH(F)", "THICKNESS(F)", "VOLUME (CF) ", "BASE LEVEL", "AREA (SF)", "COUNT",
+                      "TOTAL AREA(SF)",
+                      "COST PER SF (USD)", " COST(USD)"]
 
-        f.form_display_table(final_data, header, "Parts Material Takeoff" + "-" + user_choice)
+            f.form_display_table(final_data, header, "Parts Material Takeoff" + "-" + user_choice)
 
-        if len(unpanalized) != 0:
-            a.highlight_unpanelized_underpanelized_parts(__title__)
-            forms.alert("Highlighted parts (red) have not been panelized")
+            if len(unpanalized) != 0:
+                a.highlight_unpanelized_underpanelized_parts(__title__)
+                forms.alert("Highlighted parts (red) have not been panelized")
 
-        else:
-            forms.alert("CongratuLations! All parts have been panelized")
+            else:
+                forms.alert("CongratuLations! All parts have been panelized")
 
-    else:
-        g.highlight_unpanelized_underpanelized_parts(__title__)
-        forms.alert("Parts (red) not panelized (parts < 4 ). Proceed with Panelization")
+        else:
+            a.highlight_unpanelized_underpanelized_parts(__title__)
+            forms.alert("Parts (red) not panelized (parts < 4 ). Proceed with Panelization")
 
+    except (eh.LapTypeNotFoundError, eh.HighlightFiltersError) as error:
+        forms.alert(f.get_error_alert(error), sub_msg=str(error))
 
 
 if __name__ == "__main__":
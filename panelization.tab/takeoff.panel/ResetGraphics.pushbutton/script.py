@@ -0,0 +1,43 @@
+# METADATA
+################################################################################################################################
+
+
+__title__ = "ResetGraphics"
+
+__doc__ = """
+Reset the highlight of parts that have been panelized since, or of all parts highlighted
+"""
+
+__author__ = "Symon Kipkemei"
+__helpurl__ = "https://www.linkedin.com/in/symon-kipkemei/"
+__min_revit_ver__ = 2020
+__max_revit_ver__ = 2025
+
+# IMPORTS
+
+from Autodesk.Revit.DB import *
+
+from _create import _transactions as a
+from _create import _forms as f
+from pyrevit import forms
+import clr
+
+clr.AddReference("System")
+
+# VARIABLES
+
+app = __revit__.Application  # represents the Revit Autodesk Application
+doc = __revit__.ActiveUIDocument.Document  # obj used to create new instances of elements within the active project
+uidoc = __revit__.ActiveUIDocument  # obj that represent the current active project
+
+
+# FUNCTIONS
+
+def main():
+    all_parts = f.form_reset_graphics()
+    reset = a.remove_graphics(__title__, all_parts=all_parts)
+    forms.alert("Graphics of {} parts have been reset".format(reset))
+
+
+if __name__ == "__main__":
+    main()
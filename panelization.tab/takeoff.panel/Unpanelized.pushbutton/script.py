@@ -25,6 +25,7 @@ from Autodesk.Revit.DB import View
 from _create import _transactions as a
 from _create import _parts as g
 from _create import _forms as f
+from _create import _errorhandler as eh
 from pyrevit import forms
 import clr
 
@@ -49,13 +50,12 @@ def get_unpanelized_parts():
     Select all parts and filter to unpanelized parts
     :return: unpanelized parts
     """
-    # select interior and exterior parts
-    parts = g.select_all_parts()
-    exterior_parts, interior_parts = g.sort_parts_by_side(parts)
+    # the part table is read again for the run, in a single pass over the parts of the document
+    g.clear_part_tables()
 
-    # filter into parts that have not been panelized
-    underpanelized, panalized, unpanelized_exterior_parts = g.sort_parts_by_length(exterior_parts)
-    underpanelized, panalized, unpanelized_interior_parts = g.sort_parts_by_length(interior_parts)
+    # filter into parts that have not been panelized, filtered by length and layer index in Revit
+    parts = g.select_all_parts(length_class=1, layer_indexes=g.get_panelized_layer_indexes())
+    unpanelized_exterior_parts, unpanelized_interior_parts = g.sort_parts_by_side(parts)
 
     unpanelized_parts = unpanelized_exterior_parts + unpanelized_interior_parts
     # display there id, length, height, base_level
@@ -83,22 +83,23 @@ def get_unpanalized_parts_data(unpanelized_parts):
 
 
 def main():
-    parts = get_unpanelized_parts()
-    if len(parts) != 0:
-        parts_data = get_unpanalized_parts_data(parts)
+    try:
+        parts = get_unpanelized_parts()
+        if len(parts) != 0:
+            parts_data = get_unpanalized_parts_data(parts)
 
-        a.highlight_unpanelized_underpanelized_parts(__title__)
+            a.highlight_unpanelized_underpanelized_parts(__title__)
 
-        # display panels data
-        header = ["COUNT", "PART ID", "HEIGHT(F)", "LENGTH(F)", "BASE LEVEL"]
+            # display panels data
+            header = ["COUNT", "PART ID", "HEIGHT(F)", "LENGTH(F)", "BASE LEVEL"]
 
-        f.form_display_table(parts_data, header, "Unpanelized parts", last_line_color='color:blue;')
+            f.form_display_table(parts_data, header, "Unpanelized parts", last_line_color='color:blue;')
 
-    else:
-        forms.alert("Congratulations! All parts have been panelized")
+        else:
+            forms.alert("Congratulations! All parts have been panelized")
 
-
-    
+    except (eh.LapTypeNotFoundError, eh.HighlightFiltersError) as error:
+        forms.alert(f.get_error_alert(error), sub_msg=str(error))
 
 
 if __name__ == "__main__":